@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.gis.admin import GISModelAdmin
 
 from .models import BiodiversityRecord
@@ -15,6 +15,7 @@ class BiodiversityRecordAdmin(GISModelAdmin):
         "date",
     )
     list_filter = ("date", "species__life_form", "neighborhood__locality")
+    list_select_related = ("species__genus", "site", "neighborhood__locality")
     search_fields = (
         "id",
         "common_name",
@@ -25,18 +26,51 @@ class BiodiversityRecordAdmin(GISModelAdmin):
         "neighborhood__locality__name",
         "system_comment",
     )
+    search_help_text = "Enter a record ID or at least 3 characters to search."
     raw_id_fields = ("species", "site", "neighborhood")
     readonly_fields = ("id", "created_at", "updated_at", "uuid", "system_comment")
     date_hierarchy = "date"
     list_per_page = 25
 
+    def get_queryset(self, request):
+        # list_select_related joins the neighborhood and locality, whose
+        # boundaries none of the columns show
+        return (
+            super()
+            .get_queryset(request)
+            .defer("neighborhood__boundary", "neighborhood__locality__boundary")
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        # Numbers also match the record ID exactly, whatever their length
+        if term.isdigit():
+            by_id = queryset.filter(id=int(term))
+            if len(term) < 3:
+                return by_id, False
+            results, may_have_duplicates = super().get_search_results(
+                request, queryset, search_term
+            )
+            return results | by_id, may_have_duplicates
+        # Shorter terms match nearly every row and force a scan of each
+        # joined table, so skip the search and say so
+        if len(term) < 3:
+            if term:
+                self.message_user(
+                    request,
+                    "Search terms need at least 3 characters; showing all records.",
+                    messages.WARNING,
+                )
+            return queryset, False
+        return super().get_search_results(request, queryset, search_term)
+
     @admin.display(description="Species")
     def species_name(self, obj):
         return f"{obj.species.genus.name} {obj.species.name}"
 
     @admin.display(description="Site")
     def site_name(self, obj):
-        return obj.site.name
+        return obj.site.name if obj.site else "-"
 
     @admin.display(description="Neighborhood")
     def neighborhood_name(self, obj):
@@ -1,15 +1,75 @@
+import multiprocessing
 import time
-
-from django.contrib.gis.db.models import Extent, GeometryField
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from itertools import chain, islice, repeat
+
+from django.contrib.gis.db.models import (
+    Extent,
+    GeometryField,
+    MultiPolygonField,
+    PointField,
+)
 from django.contrib.gis.db.models.functions import Cast
+from django.contrib.gis.geos import Polygon
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from django.db.models import Q
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Case, Exists, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Concat
 from tqdm import tqdm
 
 from apps.biodiversity.models import BiodiversityRecord
+from apps.biodiversity.spatial import (
+    BoundaryIndex,
+    find_shared_positions,
+    shared_indexes,
+)
 from apps.places.models import Locality, Neighborhood
 
+# Largest number of boundaries held in memory for local containment tests.
+# Larger sets are matched with a spatial join in PostGIS instead.
+IN_MEMORY_BOUNDARY_LIMIT = 5000
+
+# Number of rows sent in each UPDATE statement issued by bulk_update.
+UPDATE_BATCH_SIZE = 500
+
+# System comments left on processed records.
+NEIGHBORHOOD_COMMENT = (
+    "Automatically assigned to neighborhood '{}' based on spatial location."
+)
+PLACEHOLDER_COMMENT = (
+    "Automatically assigned to placeholder neighborhood '{}' as record is within "
+    "locality '{}' boundary but no matching neighborhood boundary was found."
+)
+NO_MATCH_COMMENT = (
+    "No matching neighborhood or locality boundary found for this record."
+)
+
+
+@dataclass(slots=True)
+class RecordResult:
+    """Outcome of processing a single record."""
+
+    found_match: bool = False
+    neighborhood: Neighborhood | None = None
+    system_comment: str | None = None
+    updated_with_neighborhood: bool = False
+    updated_with_locality: bool = False
+
+
+def _share_thread_connection(thread_connections):
+    """Fetch thread initializer: collect the thread's connection so it can be
+    closed from the main thread once the pool has shut down."""
+    thread_connection = connections[DEFAULT_DB_ALIAS]
+    thread_connection.inc_thread_sharing()
+    thread_connections.append(thread_connection)
+
+
+def _fetch_records(records_query, ids):
+    """Thread worker: fetch part of a batch on the thread's own connection."""
+    return list(records_query.filter(id__in=ids))
+
 
 class Command(BaseCommand):
     help = "Fixes BiodiversityRecord instances assigned to the 'Desconocido' neighborhood by finding their correct neighborhoods using spatial queries."
@@ -47,6 +107,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Process all records, including those that have already been processed",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes for in-memory spatial matching, or threads for matching in PostGIS (default: 1)",
+        )
+        parser.add_argument(
+            "--in-database",
+            action="store_true",
+            help="Assign all records with set-based UPDATE statements run in PostGIS",
+        )
 
     def _prepare_query(self, unknown_neighborhood_id, all_records):
         """Prepare the base query for records that need processing."""
@@ -72,20 +143,22 @@ class Command(BaseCommand):
             id=unknown_neighborhood_id
         ).exclude(boundary__isnull=True)
 
-        self.stdout.write(
-            f"Found {valid_neighborhoods.count()} neighborhoods with boundaries"
-        )
-
         # Get all localities with boundaries
         valid_localities = Locality.objects.exclude(boundary__isnull=True)
-        self.stdout.write(
-            f"Found {valid_localities.count()} localities with boundaries"
-        )
 
-        # Get the extent of all records to filter neighborhoods
-        extent = base_query.annotate(
-            location_geom=Cast("location", GeometryField())
-        ).aggregate(extent=Extent("location_geom"))["extent"]
+        # Counting scans the boundary tables, so only do it when asked for
+        if self.verbosity > 1:
+            self.stdout.write(
+                f"Found {valid_neighborhoods.count()} neighborhoods with boundaries"
+            )
+            self.stdout.write(
+                f"Found {valid_localities.count()} localities with boundaries"
+            )
+
+        # Get the extent of all records to filter neighborhoods. ST_Extent only
+        # accepts geometry, so the geography location is cast inside the aggregate
+        location = Cast("location", GeometryField())
+        extent = base_query.aggregate(extent=Extent(location))["extent"]
 
         if extent:
             filtered_neighborhoods, filtered_localities = self._filter_by_extent(
@@ -111,136 +184,339 @@ class Command(BaseCommand):
         max_lat += buffer
 
         # Bounding box for the extent
-        bbox = (
-            f"POLYGON(("
-            f"{min_lon} {min_lat}, "
-            f"{max_lon} {min_lat}, "
-            f"{max_lon} {max_lat}, "
-            f"{min_lon} {max_lat}, "
-            f"{min_lon} {min_lat}"
-            f"))"
-        )
+        bbox = Polygon.from_bbox((min_lon, min_lat, max_lon, max_lat))
+        bbox.srid = 4326
+
+        # Filter neighborhoods whose bounding box overlaps the extent. The &&
+        # operator is answered from the spatial index alone, and containment is
+        # checked exactly later, so a bounding box pre-filter is enough here
+        filtered_neighborhoods = valid_neighborhoods.filter(boundary__bboverlaps=bbox)
 
-        # Filter neighborhoods that intersect with the extent
-        filtered_neighborhoods = valid_neighborhoods.filter(boundary__intersects=bbox)
+        # Filter localities whose bounding box overlaps the extent
+        filtered_localities = valid_localities.filter(boundary__bboverlaps=bbox)
 
-        # Filter localities that intersect with the extent
-        filtered_localities = valid_localities.filter(boundary__intersects=bbox)
+        return filtered_neighborhoods, filtered_localities
 
+    def _report_candidates(self, neighborhoods, localities):
+        """Report how many candidate boundaries are considered.
+
+        Loaded indexes already know their size, so only boundaries left in the
+        database are counted, and only when the output is asked for.
+        """
+        if self.verbosity <= 1:
+            return
+        counts = [
+            len(boundaries.boundaries)
+            if isinstance(boundaries, BoundaryIndex)
+            else boundaries.count()
+            for boundaries in (neighborhoods, localities)
+        ]
         self.stdout.write(
-            f"Filtered to {filtered_neighborhoods.count()} neighborhoods and "
-            f"{filtered_localities.count()} localities within records extent"
+            f"Filtered to {counts[0]} neighborhoods and {counts[1]} localities "
+            f"within records extent"
         )
 
-        return filtered_neighborhoods, filtered_localities
+    def _load_boundary_index(self, boundaries):
+        """Load boundaries into a BoundaryIndex, or None if there are too many."""
+        loaded = list(
+            boundaries.only("id", "name", "boundary")[: IN_MEMORY_BOUNDARY_LIMIT + 1]
+        )
+        if len(loaded) > IN_MEMORY_BOUNDARY_LIMIT:
+            return None
+        return BoundaryIndex(loaded)
+
+    def _boundaries_covering_record(self, boundaries):
+        """Filter boundaries to those covering the outer record's location.
+
+        The test runs on planar geometry, like BoundaryIndex, rather than on
+        geodesic geography math. boundary::geometry matches the expression
+        GiST index on the boundary tables, so the index is still used.
+        """
+        return boundaries.alias(
+            boundary_geom=Cast("boundary", MultiPolygonField(srid=4326))
+        ).filter(
+            boundary_geom__covers=Cast(OuterRef("location"), PointField(srid=4326))
+        )
 
-    def _process_record(
+    def _covering_boundary(self, boundaries):
+        """Subquery for the ID of the first boundary covering a record.
+
+        Slicing keeps the subquery to LIMIT 1 per record.
+        """
+        return Subquery(self._boundaries_covering_record(boundaries).values("id")[:1])
+
+    def _match_boundaries(self, records, boundaries, match_attr):
+        """Map record IDs to the first boundary containing the record location.
+
+        ``boundaries`` is either a BoundaryIndex, which is tested locally, or a
+        queryset whose spatial join already ran in PostGIS when the batch was
+        fetched, leaving the matching boundary ID on ``match_attr``.
+        """
+        if not records:
+            return {}
+
+        if isinstance(boundaries, BoundaryIndex):
+            coords = [record.location.coords for record in records]
+            if self.executor is not None:
+                positions = self._find_positions_in_workers(boundaries, coords)
+            else:
+                positions = boundaries.find_positions(coords)
+            return {
+                record.id: boundaries.boundaries[position]
+                for record, position in zip(records, positions, strict=True)
+                if position >= 0
+            }
+
+        boundary_ids = {
+            record.id: getattr(record, match_attr)
+            for record in records
+            if getattr(record, match_attr) is not None
+        }
+
+        # Boundaries are only needed by PostGIS, so keep them out of Python.
+        # Matched ones are kept for the whole run, so later batches only load
+        # the boundaries they see for the first time
+        matched = self.boundary_cache.setdefault(boundaries.model, {})
+        missing_ids = set(boundary_ids.values()) - matched.keys()
+        if missing_ids:
+            matched.update(
+                boundaries.model.objects.only("id", "name").in_bulk(missing_ids)
+            )
+        return {
+            record_id: matched[boundary_id]
+            for record_id, boundary_id in boundary_ids.items()
+        }
+
+    def _process_in_database(
         self,
-        record,
+        base_query,
+        limit,
+        total_to_process,
         filtered_neighborhoods,
         filtered_localities,
-        unknown_neighborhood_cache,
         dry_run,
     ):
-        """Process an individual record to find its neighborhood."""
-        found_match = False  # noqa: F841
-        record_result = {
-            "found_match": False,
-            "neighborhood": None,
-            "system_comment": None,
-            "updated_with_neighborhood": False,
-            "updated_with_locality": False,
-            "created_neighborhood": False,
+        """Assign neighborhoods with a few set-based UPDATE statements.
+
+        Each statement targets records matched by a spatial condition that
+        excludes the others, so records moved out of the base query by an
+        earlier statement never shift the ones left for the next.
+        """
+        # Pin limited runs to their record IDs, as the slice would otherwise
+        # move along with the updates
+        records = base_query
+        if limit:
+            records = BiodiversityRecord.objects.filter(
+                id__in=list(
+                    base_query.order_by("id").values_list("id", flat=True)[:limit]
+                )
+            )
+
+        stats = {
+            "updated_with_neighborhood": 0,
+            "updated_with_locality": 0,
+            "created_neighborhoods": 0,
+            "non_matching_records": 0,
+            "processed_records": total_to_process,
         }
 
-        # 1. First try to find a direct neighborhood match
-        matching_neighborhoods = list(
-            filtered_neighborhoods.filter(boundary__contains=record.location)
+        # 1. Records inside a neighborhood take the first covering neighborhood
+        covering_neighborhoods = self._boundaries_covering_record(
+            filtered_neighborhoods
         )
-
-        if matching_neighborhoods:
-            # Take the first matching neighborhood
-            record_result["neighborhood"] = matching_neighborhoods[0]
-            record_result["system_comment"] = (
-                f"Automatically assigned to neighborhood '{matching_neighborhoods[0].name}' "
-                f"based on spatial location."
+        in_neighborhood = records.filter(Exists(covering_neighborhoods))
+        if dry_run:
+            stats["updated_with_neighborhood"] = in_neighborhood.count()
+        else:
+            comment_prefix, comment_suffix = NEIGHBORHOOD_COMMENT.split("{}")
+            stats["updated_with_neighborhood"] = in_neighborhood.update(
+                neighborhood_id=Subquery(covering_neighborhoods.values("id")[:1]),
+                system_comment=Concat(
+                    Value(comment_prefix),
+                    Subquery(covering_neighborhoods.values("name")[:1]),
+                    Value(comment_suffix),
+                ),
             )
-            record_result["updated_with_neighborhood"] = True
-            record_result["found_match"] = True
-            return record_result
 
-        # 2. If no neighborhood match, try to find a locality match
-        matching_localities = list(
-            filtered_localities.filter(boundary__contains=record.location)
+        # 2. Records inside a locality only take its placeholder neighborhood,
+        # with one statement per locality
+        unmatched = records.filter(~Exists(covering_neighborhoods)).annotate(
+            locality_match_id=self._covering_boundary(filtered_localities)
         )
+        localities = Locality.objects.only("id", "name").in_bulk(
+            unmatched.filter(locality_match_id__isnull=False)
+            .order_by()
+            .values_list("locality_match_id", flat=True)
+            .distinct()
+        )
+        unknown_neighborhood_cache = self._seed_unknown_neighborhood_cache(
+            localities.keys()
+        )
+        stats["created_neighborhoods"] = self._create_unknown_neighborhoods(
+            localities.values(), unknown_neighborhood_cache, dry_run
+        )
+        for locality in localities.values():
+            unknown_neighborhood = unknown_neighborhood_cache[locality.id]
+            if unknown_neighborhood is None:
+                continue
+
+            in_locality = unmatched.filter(locality_match_id=locality.id)
+            if dry_run:
+                stats["updated_with_locality"] += in_locality.count()
+            else:
+                stats["updated_with_locality"] += in_locality.update(
+                    neighborhood=unknown_neighborhood,
+                    system_comment=self._assignment_comment(
+                        unknown_neighborhood, locality
+                    ),
+                )
 
-        if matching_localities:
-            # Take the first matching locality
-            locality = matching_localities[0]
-
-            # Try to get a cached neighborhood or find/create a new one
-            unknown_neighborhood, created = self._get_or_create_unknown_neighborhood(
-                locality, unknown_neighborhood_cache, dry_run
+        # 3. Whatever is left only records that no boundary matched
+        stats["non_matching_records"] = (
+            stats["processed_records"]
+            - stats["updated_with_neighborhood"]
+            - stats["updated_with_locality"]
+        )
+        if not dry_run:
+            records.filter(
+                ~Exists(covering_neighborhoods),
+                ~Exists(self._boundaries_covering_record(filtered_localities)),
+            ).update(system_comment=NO_MATCH_COMMENT)
+
+        return stats
+
+    def _split_for_workers(self, items):
+        """Split items into one contiguous chunk per worker."""
+        chunk_size = -(-len(items) // self.workers)
+        return [
+            items[start : start + chunk_size]
+            for start in range(0, len(items), chunk_size)
+        ]
+
+    def _find_positions_in_workers(self, index, coords):
+        """Split the coordinate lookups for an index across the worker pool."""
+        chunks = self._split_for_workers(coords)
+        return list(
+            chain.from_iterable(
+                self.executor.map(find_shared_positions, repeat(id(index)), chunks)
             )
+        )
+
+    def _process_record(
+        self,
+        record,
+        neighborhood,
+        locality,
+        unknown_neighborhood_cache,
+    ):
+        """Process an individual record given its matching neighborhood or locality."""
+        record_result = RecordResult()
+
+        # 1. First use the direct neighborhood match
+        if neighborhood:
+            record_result.neighborhood = neighborhood
+            record_result.system_comment = self._assignment_comment(neighborhood)
+            record_result.updated_with_neighborhood = True
+            record_result.found_match = True
+            return record_result
+
+        # 2. If no neighborhood match, fall back to the locality match
+        if locality:
+            # Placeholders for the batch's localities are created beforehand
+            unknown_neighborhood = unknown_neighborhood_cache.get(locality.id)
 
             if unknown_neighborhood:
-                record_result["neighborhood"] = unknown_neighborhood
-                record_result["system_comment"] = (
-                    f"Automatically assigned to placeholder neighborhood '{unknown_neighborhood.name}' "
-                    f"as record is within locality '{locality.name}' boundary but no matching "
-                    f"neighborhood boundary was found."
+                record_result.neighborhood = unknown_neighborhood
+                record_result.system_comment = self._assignment_comment(
+                    unknown_neighborhood, locality
                 )
-                record_result["updated_with_locality"] = True
-                record_result["found_match"] = True
-                record_result["created_neighborhood"] = created
+                record_result.updated_with_locality = True
+                record_result.found_match = True
                 return record_result
 
         # No match found
-        record_result["system_comment"] = (
-            "No matching neighborhood or locality boundary found for this record."
-        )
+        record_result.system_comment = NO_MATCH_COMMENT
 
         return record_result
 
-    def _get_or_create_unknown_neighborhood(
-        self, locality, unknown_neighborhood_cache, dry_run
+    def _assignment_comment(self, neighborhood, locality=None):
+        """Comment for a record assigned to a neighborhood, or to the
+        placeholder of a locality.
+
+        Comments only depend on the assigned neighborhood, so each is built
+        once and shared by every record assigned to it.
+        """
+        comment = self.comment_cache.get(neighborhood.id)
+        if comment is None:
+            if locality is None:
+                comment = NEIGHBORHOOD_COMMENT.format(neighborhood.name)
+            else:
+                comment = PLACEHOLDER_COMMENT.format(neighborhood.name, locality.name)
+            self.comment_cache[neighborhood.id] = comment
+        return comment
+
+    def _create_unknown_neighborhoods(
+        self, localities, unknown_neighborhood_cache, dry_run
     ):
-        """Get a cached unknown neighborhood or create a new one if needed."""
-        created = False
+        """Create the missing "Desconocido en X" neighborhoods of the given
+        localities in a single INSERT and cache them. Returns how many were
+        created.
+
+        The cache is seeded with every existing placeholder of the candidate
+        localities, so a locality missing from it has no placeholder yet.
+        In a dry run, missing placeholders are cached as None.
+        """
+        missing = {
+            locality.id: locality
+            for locality in localities
+            if locality.id not in unknown_neighborhood_cache
+        }
+        if not missing:
+            return 0
 
-        # Check if we already have a "Desconocido en X" neighborhood for this locality
-        if locality.id in unknown_neighborhood_cache:
-            unknown_neighborhood = unknown_neighborhood_cache[locality.id]
-        else:
-            # Try to find an existing "Desconocido en X" neighborhood
-            unknown_neighborhood_name = f"Desconocido en {locality.name}"
-            unknown_neighborhood = Neighborhood.objects.filter(
-                name=unknown_neighborhood_name, locality=locality
-            ).first()
-
-            # Create a new "Desconocido en X" neighborhood if it doesn't exist
-            if not unknown_neighborhood and not dry_run:
-                unknown_neighborhood = Neighborhood.objects.create(
-                    name=unknown_neighborhood_name,
+        if dry_run:
+            unknown_neighborhood_cache.update(dict.fromkeys(missing))
+            return 0
+
+        created = Neighborhood.objects.bulk_create(
+            [
+                Neighborhood(
+                    name=f"Desconocido en {locality.name}",
                     locality=locality,
                     boundary=None,  # No boundary for these special neighborhoods
                 )
-                created = True
-                self.stdout.write(
-                    f"Created new neighborhood: {unknown_neighborhood_name}"
-                )
-
-            # Cache the neighborhood for future use
-            unknown_neighborhood_cache[locality.id] = unknown_neighborhood
+                for locality in missing.values()
+            ]
+        )
+        for unknown_neighborhood in created:
+            unknown_neighborhood_cache[unknown_neighborhood.locality_id] = (
+                unknown_neighborhood
+            )
+            self.stdout.write(f"Created new neighborhood: {unknown_neighborhood.name}")
 
-        return unknown_neighborhood, created
+        return len(created)
 
-    def _bulk_update_records(self, records_to_update):
-        """Perform a bulk update of records."""
-        if records_to_update:
-            BiodiversityRecord.objects.bulk_update(
-                records_to_update, fields=["neighborhood", "system_comment"]
+    def _seed_unknown_neighborhood_cache(self, localities):
+        """Load the existing "Desconocido en X" neighborhoods of the given
+        localities in a single query, keyed by locality ID."""
+        placeholders = (
+            Neighborhood.objects.filter(
+                name__startswith="Desconocido en ", locality__in=localities
             )
+            .select_related("locality")
+            .only("id", "name", "locality__id", "locality__name")
+        )
+        return {
+            neighborhood.locality_id: neighborhood
+            for neighborhood in placeholders
+            if neighborhood.name == f"Desconocido en {neighborhood.locality.name}"
+        }
+
+    def _bulk_update_records(self, records_to_update, fields):
+        """Perform a bulk update of the given fields of records."""
+        BiodiversityRecord.objects.bulk_update(
+            records_to_update, fields=fields, batch_size=UPDATE_BATCH_SIZE
+        )
 
     def _print_final_report(self, stats, elapsed_time, dry_run):
         """Print the final report with statistics."""
@@ -268,9 +544,148 @@ class Command(BaseCommand):
                 )
             )
 
+    def _annotate_matches(self, records, filtered_neighborhoods, filtered_localities):
+        """Limit records to the fields that are read or updated, and annotate
+        the IDs of the boundaries left in PostGIS that cover them.
+
+        The locality lookup only runs for records that have no neighborhood
+        match.
+        """
+        records = records.only("id", "location", "neighborhood", "system_comment")
+
+        neighborhoods_in_db = not isinstance(filtered_neighborhoods, BoundaryIndex)
+        if neighborhoods_in_db:
+            records = records.annotate(
+                neighborhood_match_id=self._covering_boundary(filtered_neighborhoods)
+            )
+        if not isinstance(filtered_localities, BoundaryIndex):
+            locality_match = self._covering_boundary(filtered_localities)
+            if neighborhoods_in_db:
+                locality_match = Case(
+                    When(neighborhood_match_id__isnull=True, then=locality_match)
+                )
+            records = records.annotate(locality_match_id=locality_match)
+
+        return records
+
+    def _iter_batches(
+        self,
+        base_query,
+        filtered_neighborhoods,
+        filtered_localities,
+        batch_size,
+        total_to_process,
+    ):
+        """Yield the records to process, batch_size at a time.
+
+        Records are streamed in ID order from a server-side cursor. The cursor
+        reads a snapshot taken when it is opened, so records updated by earlier
+        batches do not shift the remaining ones.
+        """
+        if self.fetch_executor is None:
+            # The cursor returns each record with its PostGIS matches, so a
+            # batch costs a single query
+            stream = (
+                self._annotate_matches(
+                    base_query, filtered_neighborhoods, filtered_localities
+                )
+                .order_by("id")
+                .iterator(chunk_size=batch_size)
+            )
+        else:
+            # Only IDs are streamed; each batch is then matched over threads
+            stream = (
+                base_query.order_by("id")
+                .values_list("id", flat=True)
+                .iterator(chunk_size=batch_size)
+            )
+            records_query = self._annotate_matches(
+                BiodiversityRecord.objects.order_by(),
+                filtered_neighborhoods,
+                filtered_localities,
+            )
+
+        remaining = total_to_process
+        while remaining > 0:
+            batch = list(islice(stream, min(batch_size, remaining)))
+            if not batch:
+                break
+            remaining -= len(batch)
+
+            if self.fetch_executor is None:
+                yield batch
+            else:
+                # Matching in PostGIS dominates, so the batch is split over
+                # threads with a connection each. They only read boundaries and
+                # records no earlier batch touched, so not seeing this run's
+                # uncommitted writes is harmless
+                yield list(
+                    chain.from_iterable(
+                        self.fetch_executor.map(
+                            _fetch_records,
+                            repeat(records_query),
+                            self._split_for_workers(batch),
+                        )
+                    )
+                )
+
+    @contextmanager
+    def _fetch_pool(self):
+        """Thread pool fetching batches matched in PostGIS.
+
+        Each thread keeps its connection across batches; they are all closed
+        once, after the pool has shut down.
+        """
+        thread_connections = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.workers,
+                initializer=_share_thread_connection,
+                initargs=(thread_connections,),
+            ) as pool:
+                yield pool
+        finally:
+            for thread_connection in thread_connections:
+                thread_connection.close()
+                thread_connection.dec_thread_sharing()
+
+    @contextmanager
+    def _worker_pools(self, indexes):
+        """Start the worker pools of a run and shut them down when it ends.
+
+        In-memory indexes are matched over worker processes. The indexes are
+        registered before the pool forks so workers inherit them, and all
+        workers are forked up front, before any fetch thread, transaction or
+        server-side cursor exists. Boundaries left in PostGIS are fetched over
+        a pool of threads instead. Pools and registrations are released
+        however the run ends.
+        """
+        use_processes = self.workers > 1 and bool(indexes)
+        use_threads = self.workers > 1 and len(indexes) < 2
+        try:
+            with ExitStack() as stack:
+                if use_processes:
+                    shared_indexes.update((id(index), index) for index in indexes)
+                    self.executor = stack.enter_context(
+                        ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("fork"),
+                        )
+                    )
+                    # With the fork context, the first task forks every worker
+                    self.executor.submit(int).result()
+                if use_threads:
+                    self.fetch_executor = stack.enter_context(self._fetch_pool())
+                yield
+        finally:
+            self.executor = None
+            self.fetch_executor = None
+            for index in indexes:
+                shared_indexes.pop(id(index), None)
+
     def _process_batch(  # noqa: C901
         self,
-        batch_ids,
+        batch_records,
         filtered_neighborhoods,
         filtered_localities,
         unknown_neighborhood_cache,
@@ -279,11 +694,28 @@ class Command(BaseCommand):
     ):
         """Process a batch of records."""
         # Skip if batch is empty
-        if not batch_ids:
+        if not batch_records:
             return 0
 
-        # Fetch the full records for this batch
-        batch_records = list(BiodiversityRecord.objects.filter(id__in=batch_ids))
+        # Resolve the containing neighborhood for the whole batch at once, then
+        # the containing locality for the records left without a neighborhood
+        neighborhood_matches = self._match_boundaries(
+            batch_records, filtered_neighborhoods, "neighborhood_match_id"
+        )
+        locality_matches = self._match_boundaries(
+            [
+                record
+                for record in batch_records
+                if record.id not in neighborhood_matches
+            ],
+            filtered_localities,
+            "locality_match_id",
+        )
+
+        # Create the placeholders this batch needs in one go
+        stats["created_neighborhoods"] += self._create_unknown_neighborhoods(
+            locality_matches.values(), unknown_neighborhood_cache, dry_run
+        )
 
         # Process each record in the batch
         neighborhood_updates = {}  # record_id -> neighborhood
@@ -292,69 +724,75 @@ class Command(BaseCommand):
         for record in batch_records:
             result = self._process_record(
                 record,
-                filtered_neighborhoods,
-                filtered_localities,
+                neighborhood_matches.get(record.id),
+                locality_matches.get(record.id),
                 unknown_neighborhood_cache,
-                dry_run,
             )
 
-            if result["neighborhood"]:
-                neighborhood_updates[record.id] = result["neighborhood"]
+            if result.neighborhood:
+                neighborhood_updates[record.id] = result.neighborhood
 
-            if result["system_comment"]:
-                system_comment_updates[record.id] = result["system_comment"]
+            if result.system_comment:
+                system_comment_updates[record.id] = result.system_comment
 
             # Update statistics
-            if result["updated_with_neighborhood"]:
+            if result.updated_with_neighborhood:
                 stats["updated_with_neighborhood"] += 1
-            if result["updated_with_locality"]:
+            if result.updated_with_locality:
                 stats["updated_with_locality"] += 1
-            if result["created_neighborhood"]:
-                stats["created_neighborhoods"] += 1
-            if not result["found_match"]:
+            if not result.found_match:
                 stats["non_matching_records"] += 1
 
         # Bulk update records with their new neighborhoods and comments
         if (neighborhood_updates or system_comment_updates) and not dry_run:
-            with transaction.atomic():
-                # Prepare records for bulk update
-                records_to_update = []
-
-                # First, load all affected records in a single query to reduce database hits
-                affected_ids = set(neighborhood_updates.keys()) | set(
-                    system_comment_updates.keys()
-                )
-                records_dict = {
-                    record.id: record
-                    for record in BiodiversityRecord.objects.filter(id__in=affected_ids)
-                }
-
-                # Update records with new neighborhoods
-                for record_id, new_neighborhood in neighborhood_updates.items():
-                    if record_id in records_dict:
-                        record = records_dict[record_id]
-                        record.neighborhood = new_neighborhood
-                        record.system_comment = system_comment_updates.get(
-                            record_id, ""
-                        )
-                        records_to_update.append(record)
-
-                # Update records that have comments but no neighborhood updates
-                comment_only_ids = set(system_comment_updates.keys()) - set(
-                    neighborhood_updates.keys()
+            # Prepare records for bulk update
+            records_to_update = []
+            comment_only_records = []
+
+            # Reuse the records already fetched for this batch
+            records_dict = {record.id: record for record in batch_records}
+
+            # Update records with new neighborhoods
+            for record_id, new_neighborhood in neighborhood_updates.items():
+                if record_id in records_dict:
+                    record = records_dict[record_id]
+                    new_comment = system_comment_updates.get(record_id, "")
+                    # Skip records that already hold these values
+                    if (
+                        record.neighborhood_id == new_neighborhood.id
+                        and record.system_comment == new_comment
+                    ):
+                        continue
+                    record.neighborhood = new_neighborhood
+                    record.system_comment = new_comment
+                    records_to_update.append(record)
+
+            # Update records that have comments but no neighborhood updates
+            comment_only_ids = set(system_comment_updates.keys()) - set(
+                neighborhood_updates.keys()
+            )
+            for record_id in comment_only_ids:
+                if record_id in records_dict:
+                    record = records_dict[record_id]
+                    # Non-matching records keep the same comment on every run
+                    if record.system_comment == system_comment_updates[record_id]:
+                        continue
+                    record.system_comment = system_comment_updates[record_id]
+                    comment_only_records.append(record)
+
+            # Skip the round-trip when every record already holds its values.
+            # Comment-only records leave the neighborhood column out of the
+            # generated CASE statement.
+            if records_to_update:
+                self._bulk_update_records(
+                    records_to_update, ["neighborhood", "system_comment"]
                 )
-                for record_id in comment_only_ids:
-                    if record_id in records_dict:
-                        record = records_dict[record_id]
-                        record.system_comment = system_comment_updates[record_id]
-                        records_to_update.append(record)
-
-                # Perform the bulk update if there are records to update
-                self._bulk_update_records(records_to_update)
+            if comment_only_records:
+                self._bulk_update_records(comment_only_records, ["system_comment"])
 
         return len(batch_records)
 
-    def handle(self, *args, **options):
+    def handle(self, *args, **options):  # noqa: C901
         """Handle the command execution."""
         # Get command options
         dry_run = options.get("dry_run", False)
@@ -363,6 +801,13 @@ class Command(BaseCommand):
         unknown_neighborhood_id = options.get("neighborhood_id")
         stats_only = options.get("stats_only", False)
         all_records = options.get("all_records", False)
+        self.verbosity = options.get("verbosity", 1)
+        in_database = options.get("in_database", False)
+        self.workers = max(options.get("workers", 1), 1)
+        self.executor = None
+        self.fetch_executor = None
+        self.boundary_cache = {}
+        self.comment_cache = {}
 
         start_time = time.time()
 
@@ -395,9 +840,36 @@ class Command(BaseCommand):
             base_query, unknown_neighborhood_id
         )
 
-        # Create a dictionary to cache "Desconocido en X" neighborhoods
+        if in_database:
+            self._report_candidates(filtered_neighborhoods, filtered_localities)
+            with transaction.atomic():
+                stats = self._process_in_database(
+                    base_query,
+                    limit,
+                    total_to_process,
+                    filtered_neighborhoods,
+                    filtered_localities,
+                    dry_run,
+                )
+            self._print_final_report(stats, time.time() - start_time, dry_run)
+            return
+
+        # Cache "Desconocido en X" neighborhoods, seeded with the ones that
+        # already exist for the candidate localities
         # Key: locality_id, Value: neighborhood
-        unknown_neighborhood_cache = {}
+        unknown_neighborhood_cache = self._seed_unknown_neighborhood_cache(
+            filtered_localities
+        )
+
+        # Hold the candidate boundaries in memory when there are few enough of
+        # them, otherwise keep matching against the database
+        neighborhood_index = self._load_boundary_index(filtered_neighborhoods)
+        if neighborhood_index is not None:
+            filtered_neighborhoods = neighborhood_index
+        locality_index = self._load_boundary_index(filtered_localities)
+        if locality_index is not None:
+            filtered_localities = locality_index
+        self._report_candidates(filtered_neighborhoods, filtered_localities)
 
         # Statistics tracking
         stats = {
@@ -408,20 +880,27 @@ class Command(BaseCommand):
             "processed_records": 0,
         }
 
-        # Get all record IDs before processing to prevent issues with pagination or filtering
-        all_record_ids = list(base_query.values_list("id", flat=True))
-        total_to_process = min(total_to_process, len(all_record_ids))
-
-        # Process in batches for better performance
-        with tqdm(total=total_to_process, desc="Processing records") as progress_bar:
-            # Process IDs in batches
-            for batch_start in range(0, total_to_process, batch_size):
-                batch_end = min(batch_start + batch_size, total_to_process)
-                batch_ids = all_record_ids[batch_start:batch_end]
-
+        # Process in batches for better performance. All batches share one
+        # transaction, so the run commits once instead of once per batch
+        indexes = [
+            index for index in (neighborhood_index, locality_index) if index is not None
+        ]
+        with (
+            self._worker_pools(indexes),
+            transaction.atomic(),
+            tqdm(total=total_to_process, desc="Processing records") as progress_bar,
+        ):
+            batches = self._iter_batches(
+                base_query,
+                filtered_neighborhoods,
+                filtered_localities,
+                batch_size,
+                total_to_process,
+            )
+            for batch_records in batches:
                 # Process the current batch
                 processed_batch_size = self._process_batch(
-                    batch_ids,
+                    batch_records,
                     filtered_neighborhoods,
                     filtered_localities,
                     unknown_neighborhood_cache,
@@ -432,20 +911,12 @@ class Command(BaseCommand):
                 stats["processed_records"] += processed_batch_size
                 progress_bar.update(processed_batch_size)
 
-                # Print interim progress report
-                if (
-                    stats["processed_records"] % 1000 == 0
-                    or batch_end == total_to_process
-                ):
-                    elapsed_time = time.time() - start_time
-                    records_per_second = (
-                        stats["processed_records"] / elapsed_time
-                        if elapsed_time > 0
-                        else 0
-                    )
-                    self.stdout.write(
-                        f"Processed {stats['processed_records']}/{total_to_process} records "
-                        f"({records_per_second:.2f} records/sec)"
+                # Show the throughput on the bar; tqdm throttles its redraws
+                elapsed_time = time.time() - start_time
+                if elapsed_time > 0:
+                    records_per_second = stats["processed_records"] / elapsed_time
+                    progress_bar.set_postfix_str(
+                        f"{records_per_second:.0f} rec/s", refresh=False
                     )
 
         # Final report
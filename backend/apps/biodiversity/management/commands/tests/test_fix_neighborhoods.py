@@ -4,7 +4,14 @@ import pytest
 from django.contrib.gis.geos import MultiPolygon, Point, Polygon
 from django.core.management import call_command
 
+from apps.biodiversity.management.commands import fix_biodiversity_neighborhoods
+from apps.biodiversity.management.commands.fix_biodiversity_neighborhoods import (
+    NEIGHBORHOOD_COMMENT,
+    PLACEHOLDER_COMMENT,
+    Command,
+)
 from apps.biodiversity.models import BiodiversityRecord
+from apps.biodiversity.spatial import shared_indexes
 from apps.places.models import Locality, Neighborhood
 
 
@@ -90,6 +97,31 @@ class TestFixNeighborhoodsCommand:
             "record_outside": record_outside,
         }
 
+    def _assert_assignments(self, test_data):
+        """Check the assignments and comments every matching path must agree on."""
+        expected = {
+            "record_center": ("Center", NEIGHBORHOOD_COMMENT.format("Center")),
+            "record_north": ("North", NEIGHBORHOOD_COMMENT.format("North")),
+            "record_locality": (
+                "Desconocido en COMUNA 2",
+                PLACEHOLDER_COMMENT.format("Desconocido en COMUNA 2", "COMUNA 2"),
+            ),
+            "record_outside": (
+                "Desconocido en Test Locality",
+                PLACEHOLDER_COMMENT.format(
+                    "Desconocido en Test Locality", "Test Locality"
+                ),
+            ),
+        }
+        for key, (neighborhood_name, comment) in expected.items():
+            record = BiodiversityRecord.objects.select_related("neighborhood").get(
+                id=test_data[key].id
+            )
+            assert (record.neighborhood.name, record.system_comment) == (
+                neighborhood_name,
+                comment,
+            ), key
+
     def test_fix_neighborhoods(self, setup_test_data):
         """Test the fix_biodiversity_neighborhoods command."""
         test_data = setup_test_data
@@ -143,6 +175,7 @@ class TestFixNeighborhoodsCommand:
         assert record_outside.neighborhood.name.startswith("Desconocido en")
         assert "placeholder neighborhood" in record_outside.system_comment
         assert "locality" in record_outside.system_comment
+        self._assert_assignments(test_data)
 
     def test_batch_processing(self, setup_test_data):
         """Test processing with small batch size."""
@@ -182,6 +215,129 @@ class TestFixNeighborhoodsCommand:
         assert "placeholder neighborhood" in record_outside.system_comment
         assert "locality" in record_outside.system_comment
 
+    @pytest.mark.parametrize("batch_size", [1, 500])
+    def test_boundaries_matched_in_postgis(
+        self, setup_test_data, monkeypatch, batch_size
+    ):
+        """Test that matching in PostGIS assigns the same as matching in memory."""
+        test_data = setup_test_data
+        # Leave every boundary in the database, as for large boundary sets
+        monkeypatch.setattr(
+            fix_biodiversity_neighborhoods, "IN_MEMORY_BOUNDARY_LIMIT", 0
+        )
+
+        out = StringIO()
+        call_command(
+            "fix_biodiversity_neighborhoods",
+            f"--neighborhood-id={test_data['unknown_neighborhood'].id}",
+            f"--batch-size={batch_size}",
+            stdout=out,
+        )
+
+        assert "- Total records processed: 4" in out.getvalue()
+        self._assert_assignments(test_data)
+
+    def test_workers_match_in_processes(self, setup_test_data):
+        """Test that in-memory matching over worker processes assigns the same."""
+        test_data = setup_test_data
+
+        out = StringIO()
+        call_command(
+            "fix_biodiversity_neighborhoods",
+            neighborhood_id=test_data["unknown_neighborhood"].id,
+            workers=2,
+            stdout=out,
+        )
+
+        assert "- Total records processed: 4" in out.getvalue()
+        self._assert_assignments(test_data)
+
+    def test_workers_release_indexes_on_error(self, setup_test_data, monkeypatch):
+        """Test that a failing run does not leave its indexes registered."""
+        test_data = setup_test_data
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("batch failed")
+
+        monkeypatch.setattr(Command, "_process_batch", fail)
+
+        with pytest.raises(RuntimeError):
+            call_command(
+                "fix_biodiversity_neighborhoods",
+                neighborhood_id=test_data["unknown_neighborhood"].id,
+                workers=2,
+                stdout=StringIO(),
+            )
+        assert not shared_indexes
+
+    # Fetch threads read on their own connections, so the test data must be
+    # committed for them to see it
+    @pytest.mark.django_db(transaction=True)
+    def test_workers_fetch_in_threads(self, setup_test_data, monkeypatch):
+        """Test that fetching PostGIS matches over threads assigns the same."""
+        test_data = setup_test_data
+        monkeypatch.setattr(
+            fix_biodiversity_neighborhoods, "IN_MEMORY_BOUNDARY_LIMIT", 0
+        )
+
+        out = StringIO()
+        call_command(
+            "fix_biodiversity_neighborhoods",
+            neighborhood_id=test_data["unknown_neighborhood"].id,
+            workers=2,
+            batch_size=2,
+            stdout=out,
+        )
+
+        assert "- Total records processed: 4" in out.getvalue()
+        self._assert_assignments(test_data)
+
+    def test_covering_boundary_uses_planar_index(self, setup_test_data, prefer_indexes):
+        """Test that the PostGIS covering lookups use the boundary::geometry index."""
+        records = Command()._annotate_matches(
+            BiodiversityRecord.objects.all(),
+            Neighborhood.objects.exclude(boundary__isnull=True),
+            Locality.objects.exclude(boundary__isnull=True),
+        )
+        plan = records.explain()
+
+        assert "neighborhood_boundary_geom_gist" in plan
+        assert "locality_boundary_geom_gist" in plan
+
+    def test_in_database_mode(self, setup_test_data):
+        """Test that set-based updates assign the same neighborhoods."""
+        test_data = setup_test_data
+
+        out = StringIO()
+        call_command(
+            "fix_biodiversity_neighborhoods",
+            f"--neighborhood-id={test_data['unknown_neighborhood'].id}",
+            "--in-database",
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        assert "Processing complete" in output
+        assert "- Total records processed: 4" in output
+
+        record_center = BiodiversityRecord.objects.get(id=test_data["record_center"].id)
+        record_north = BiodiversityRecord.objects.get(id=test_data["record_north"].id)
+        record_locality = BiodiversityRecord.objects.get(
+            id=test_data["record_locality"].id
+        )
+
+        assert record_center.neighborhood.id == test_data["center_neighborhood"].id
+        assert record_center.system_comment == (
+            "Automatically assigned to neighborhood 'Center' based on spatial location."
+        )
+        assert record_north.neighborhood.id == test_data["north_neighborhood"].id
+        assert (
+            record_locality.neighborhood.name
+            == f"Desconocido en {test_data['other_locality'].name}"
+        )
+        assert "placeholder neighborhood" in record_locality.system_comment
+        assert "COMUNA 2" in record_locality.system_comment
+
     def test_dry_run_mode(self, setup_test_data):
         """Test that dry-run mode doesn't change the database."""
         test_data = setup_test_data
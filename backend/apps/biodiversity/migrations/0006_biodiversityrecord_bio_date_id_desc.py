@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2025-05-10 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodiversity', '0005_biodiversityrecord_system_comment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='biodiversityrecord',
+            index=models.Index(fields=['-date', '-id'], name='bio_date_id_desc'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2025-05-10 11:40
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodiversity', '0006_biodiversityrecord_bio_date_id_desc'),
+        ('taxonomy', '0003_species_name_upper_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='biodiversityrecord',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('common_name'), name='gin_trgm_ops'), name='bio_common_name_upper_trgm'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2025-05-13 10:10
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biodiversity', '0007_biodiversityrecord_bio_common_name_upper_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='biodiversityrecord',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.PointField(srid=4326)), name='bio_location_geom_gist'),
+        ),
+    ]
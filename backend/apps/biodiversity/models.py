@@ -1,5 +1,7 @@
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
 from django.db import models
+from django.db.models.functions import Cast, Upper
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
@@ -50,6 +52,22 @@ class BiodiversityRecord(BaseModel):
         verbose_name = _("biodiversity record")
         verbose_name_plural = _("biodiversity records")
         ordering = ["species", "location"]
+        indexes = [
+            # Trigram index for the API's common name search. icontains
+            # compares UPPER(column), so that is the indexed expression
+            GinIndex(
+                OpClass(Upper("common_name"), name="gin_trgm_ops"),
+                name="bio_common_name_upper_trgm",
+            ),
+            # Matches the API's default ordering, so pages are read from the
+            # index instead of sorting the whole table
+            models.Index(fields=["-date", "-id"], name="bio_date_id_desc"),
+            # Planar index for bounding box tests on location::geometry
+            GistIndex(
+                Cast("location", gis_models.PointField(srid=4326)),
+                name="bio_location_geom_gist",
+            ),
+        ]
 
     def __str__(self):
         """Return a string representation of the biodiversity record.
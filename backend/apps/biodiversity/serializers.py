@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework_gis.fields import GeometryField
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 
 from apps.places.serializers import NeighborhoodLightSerializer, SiteLightSerializer
@@ -6,6 +7,9 @@ from apps.taxonomy.serializers import SpeciesLightSerializer
 
 from .models import BiodiversityRecord
 
+# Decimal places kept in GeoJSON coordinates, about 11 cm on the ground
+GEOJSON_PRECISION = 6
+
 
 class BiodiversityRecordSerializer(serializers.ModelSerializer):
     """Standard serializer for BiodiversityRecord model."""
@@ -41,6 +45,7 @@ class BiodiversityRecordSerializer(serializers.ModelSerializer):
 class BiodiversityRecordGeoSerializer(GeoFeatureModelSerializer):
     """GeoJSON serializer for BiodiversityRecord model."""
 
+    location = GeometryField(precision=GEOJSON_PRECISION, read_only=True)
     species = SpeciesLightSerializer(read_only=True)
     site = SiteLightSerializer(read_only=True)
     neighborhood = NeighborhoodLightSerializer(read_only=True)
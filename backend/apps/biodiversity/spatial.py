@@ -0,0 +1,170 @@
+"""In-memory spatial matching of points against neighborhood or locality
+boundaries, kept free of database access so it can be profiled on its own."""
+
+import numpy as np
+from django.contrib.gis.geos import Point, Polygon
+
+# Boundary indexes shared with worker processes, keyed by id(). Workers are
+# forked after the indexes are registered, so they inherit them without pickling.
+shared_indexes = {}
+
+
+class BoundaryIndex:
+    """In-memory point-in-polygon index over neighborhood or locality boundaries.
+
+    Boundaries are bucketed into a uniform grid by their envelope and clipped
+    to each cell they overlap, so a lookup only runs exact containment tests
+    against the small pieces of the few boundaries sharing the point's grid
+    cell, much like ST_Subdivide does for PostGIS. Candidates are tested in
+    the order the boundaries were given. Cells lying entirely inside their
+    first candidate resolve to it without any containment test. Invalid
+    (e.g. self-intersecting) boundaries cannot be clipped, and clips that are
+    not polygonal cannot be prepared, so those are tested whole.
+    """
+
+    # Grid value for cells whose points need exact containment tests
+    NEEDS_TEST = -2
+
+    def __init__(self, boundaries, cells_per_side=64):
+        self.boundaries = boundaries
+        self.prepared = [obj.boundary.prepared for obj in boundaries]
+        self.valid = [obj.boundary.valid for obj in boundaries]
+        self.cells = {}
+        self.covered = {}
+        # Prepared pieces of each candidate clipped to the cell, with their
+        # envelopes as plain tuples so pieces whose envelope misses the point
+        # are skipped without calling into GEOS
+        self.parts = {}
+
+        extents = [obj.boundary.extent for obj in boundaries]
+        if not extents:
+            return
+
+        self.min_x = min(extent[0] for extent in extents)
+        self.min_y = min(extent[1] for extent in extents)
+        max_x = max(extent[2] for extent in extents)
+        max_y = max(extent[3] for extent in extents)
+        self.cell_width = (max_x - self.min_x) / cells_per_side or 1.0
+        self.cell_height = (max_y - self.min_y) / cells_per_side or 1.0
+
+        for position, (xmin, ymin, xmax, ymax) in enumerate(extents):
+            first_col, first_row = self._cell(xmin, ymin)
+            last_col, last_row = self._cell(xmax, ymax)
+            for col in range(first_col, last_col + 1):
+                for row in range(first_row, last_row + 1):
+                    self.cells.setdefault((col, row), []).append(position)
+
+        for cell, candidates in self.cells.items():
+            self._resolve_cell(cell, candidates)
+
+        # Resolution of every cell: -1 when no boundary reaches it, the
+        # boundary position when covered, NEEDS_TEST otherwise
+        cols, rows = zip(*self.cells, strict=True)
+        self.grid = np.full((max(cols) + 1, max(rows) + 1), -1, dtype=np.int64)
+        for (col, row), position in self.covered.items():
+            self.grid[col, row] = position
+        for col, row in self.parts:
+            self.grid[col, row] = self.NEEDS_TEST
+
+    def _resolve_cell(self, cell, candidates):
+        """Mark the cell as covered by its first candidate, or keep the pieces
+        of the candidates that actually reach it."""
+        col, row = cell
+        xmin = self.min_x + col * self.cell_width
+        ymin = self.min_y + row * self.cell_height
+        bbox = Polygon.from_bbox(
+            (xmin, ymin, xmin + self.cell_width, ymin + self.cell_height)
+        )
+        first = candidates[0]
+        if self.valid[first] and self.prepared[first].covers(bbox):
+            self.covered[cell] = first
+            return
+
+        parts = []
+        for position in candidates:
+            boundary = self.boundaries[position].boundary
+            if not self.valid[position]:
+                # GEOS refuses to intersect invalid geometries, while a plain
+                # containment test still works on them, as it did in PostGIS
+                parts.append((position, boundary.extent, self.prepared[position]))
+                continue
+            part = boundary.intersection(bbox)
+            if part.empty:
+                continue
+            if part.geom_type in ("Polygon", "MultiPolygon"):
+                parts.append((position, part.extent, part.prepared))
+            else:
+                # Edges lying on the cell border come back as lines alongside
+                # the polygons, and GEOS before 3.13 cannot run prepared tests
+                # on such a collection, so test the whole boundary instead
+                parts.append((position, boundary.extent, self.prepared[position]))
+        if parts:
+            self.parts[cell] = parts
+
+    def _cell(self, x, y):
+        return (
+            int((x - self.min_x) // self.cell_width),
+            int((y - self.min_y) // self.cell_height),
+        )
+
+    def _find_in_cell(self, x, y, cell):
+        point = None
+        for position, (xmin, ymin, xmax, ymax), prepared in self.parts.get(cell, ()):
+            if not (xmin <= x <= xmax and ymin <= y <= ymax):
+                continue
+            if point is None:
+                point = Point(x, y)
+            if prepared.covers(point):
+                return position
+        return -1
+
+    def find_positions(self, coords):
+        """Return the position of the first boundary containing each (x, y)
+        pair, or -1 where there is none.
+
+        Grid cells for the whole batch of coordinates are resolved in a single
+        vectorized step; exact containment tests only run for the points in
+        cells that are neither empty nor covered by their first candidate.
+        """
+        if not self.cells or not coords:
+            return [-1] * len(coords)
+
+        array = np.asarray(coords, dtype=float)
+        cols = np.floor_divide(array[:, 0] - self.min_x, self.cell_width).astype(int)
+        rows = np.floor_divide(array[:, 1] - self.min_y, self.cell_height).astype(int)
+        inside = (
+            (cols >= 0)
+            & (rows >= 0)
+            & (cols < self.grid.shape[0])
+            & (rows < self.grid.shape[1])
+        )
+
+        positions = np.full(len(coords), -1, dtype=np.int64)
+        positions[inside] = self.grid[cols[inside], rows[inside]]
+        # Results of exact tests by coordinate, as survey records often share
+        # the same location. Only kept for this batch, so memory stays bounded
+        # by the batch size however many distinct points a run goes through
+        memo = {}
+        for i in np.flatnonzero(positions == self.NEEDS_TEST).tolist():
+            x, y = coords[i]
+            if (x, y) not in memo:
+                memo[x, y] = self._find_in_cell(x, y, (int(cols[i]), int(rows[i])))
+            positions[i] = memo[x, y]
+        return positions.tolist()
+
+    def find(self, point):
+        """Return the first boundary containing the point, or None."""
+        return self.find_all([point])[0]
+
+    def find_all(self, points):
+        """Return the first boundary containing each point, or None, in order."""
+        positions = self.find_positions([point.coords for point in points])
+        return [
+            self.boundaries[position] if position >= 0 else None
+            for position in positions
+        ]
+
+
+def find_shared_positions(index_key, coords):
+    """Worker entry point: look up coordinates in a shared BoundaryIndex."""
+    return shared_indexes[index_key].find_positions(coords)
@@ -0,0 +1,55 @@
+import pytest
+from django.urls import reverse
+
+from apps.biodiversity.factories import BiodiversityRecordFactory
+
+
+@pytest.mark.django_db
+class TestBiodiversityRecordAdminSearch:
+    """Test the search box of the biodiversity record changelist."""
+
+    def test_search_by_id(
+        self, client, admin_user, biodiversity_record, species, site, neighborhood
+    ):
+        """Test that a numeric term finds the record with that ID."""
+        # Related names without digits, so only the ID can match
+        BiodiversityRecordFactory.create_batch(
+            2, species=species, site=site, neighborhood=neighborhood
+        )
+        client.force_login(admin_user)
+        url = reverse("admin:biodiversity_biodiversityrecord_changelist")
+
+        response = client.get(url, {"q": str(biodiversity_record.id)})
+
+        assert response.status_code == 200
+        assert list(response.context["cl"].result_list) == [biodiversity_record]
+
+    def test_numeric_search_matches_id_and_text(
+        self, client, admin_user, species, site, neighborhood
+    ):
+        """Test that a numeric term finds records by ID as well as by text."""
+        related = {"species": species, "site": site, "neighborhood": neighborhood}
+        by_id = BiodiversityRecordFactory(id=987654, common_name="Ceiba", **related)
+        by_name = BiodiversityRecordFactory(common_name="Samán 987654", **related)
+        BiodiversityRecordFactory(common_name="Guayacán", **related)
+        client.force_login(admin_user)
+        url = reverse("admin:biodiversity_biodiversityrecord_changelist")
+
+        response = client.get(url, {"q": "987654"})
+
+        assert response.status_code == 200
+        assert set(response.context["cl"].result_list) == {by_id, by_name}
+
+    def test_short_term_shows_all_records_with_warning(
+        self, client, admin_user, biodiversity_record
+    ):
+        """Test that a term under 3 characters is ignored with a message."""
+        BiodiversityRecordFactory.create_batch(2)
+        client.force_login(admin_user)
+        url = reverse("admin:biodiversity_biodiversityrecord_changelist")
+
+        response = client.get(url, {"q": "ab"})
+
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == 3
+        assert "Search terms need at least 3 characters" in response.content.decode()
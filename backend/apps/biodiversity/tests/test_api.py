@@ -2,9 +2,17 @@ import json
 
 import pytest
 from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
+from apps.biodiversity.factories import BiodiversityRecordFactory
+from apps.biodiversity.models import BiodiversityRecord
+from apps.biodiversity.views import BiodiversityRecordFilter
+from apps.places.models import Neighborhood, Site
+from apps.taxonomy.models import Genus, Species
+
 
 @pytest.mark.django_db
 class TestBiodiversityRecordAPI:
@@ -31,6 +39,38 @@ class TestBiodiversityRecordAPI:
         assert "longitude" in response.data["results"][0]
         assert "latitude" in response.data["results"][0]
 
+    def test_biodiversity_record_list_breaks_date_ties_by_id(
+        self, authenticated_client, biodiversity_record
+    ):
+        """Test that records sharing a date are listed newest ID first."""
+        same_day = BiodiversityRecordFactory.create_batch(
+            2, date=biodiversity_record.date
+        )
+        url = reverse("biodiversity:biodiversity-record-list")
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["id"] for record in response.data["results"]] == sorted(
+            [biodiversity_record.id, *(record.id for record in same_day)],
+            reverse=True,
+        )
+
+    def test_biodiversity_record_list_compression_and_etag(
+        self, authenticated_client, biodiversity_record
+    ):
+        """Test that list responses are gzipped and support conditional GETs."""
+        url = reverse("biodiversity:biodiversity-record-list")
+        response = authenticated_client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Encoding"] == "gzip"
+
+        response = authenticated_client.get(
+            url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
     def test_biodiversity_record_detail(
         self, authenticated_client, biodiversity_record
     ):
@@ -143,6 +183,73 @@ class TestBiodiversityFilters:
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["id"] == biodiversity_record.id
 
+    def test_search_by_related_names(self, authenticated_client, biodiversity_record):
+        """Test searching biodiversity records by genus and neighborhood name."""
+        url = reverse("biodiversity:biodiversity-record-list")
+
+        for term in (
+            biodiversity_record.species.genus.name,
+            biodiversity_record.neighborhood.name,
+        ):
+            response = authenticated_client.get(url, {"search": term})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert [record["id"] for record in response.data["results"]] == [
+                biodiversity_record.id
+            ]
+
+    def test_search_reads_records_through_indexes(
+        self, biodiversity_record, prefer_indexes
+    ):
+        """Test that every branch of the search is answered by an index."""
+        queryset = BiodiversityRecordFilter(
+            {"search": biodiversity_record.common_name},
+            queryset=BiodiversityRecord.objects.order_by(),
+        ).qs
+        plan = queryset.explain()
+
+        assert "BitmapOr" in plan
+        for index_name in (
+            "bio_common_name_upper_trgm",
+            "species_name_upper_trgm",
+            "genus_name_upper_trgm",
+            "site_name_upper_trgm",
+            "neighborhood_name_upper_trgm",
+        ):
+            assert index_name in plan
+        assert "Seq Scan" not in plan
+
+    def test_search_runs_a_single_query(self, biodiversity_record):
+        """Test that related names are matched within the same statement."""
+        queryset = BiodiversityRecordFilter(
+            {"search": biodiversity_record.neighborhood.name},
+            queryset=BiodiversityRecord.objects.all(),
+        ).qs
+
+        with CaptureQueriesContext(connection) as queries:
+            assert list(queryset) == [biodiversity_record]
+
+        assert len(queries) == 1
+        assert "= ANY(ARRAY(" in queries[0]["sql"]
+
+    @pytest.mark.parametrize(
+        ("model", "field", "index_name"),
+        [
+            (BiodiversityRecord, "common_name", "bio_common_name_upper_trgm"),
+            (Species, "name", "species_name_upper_trgm"),
+            (Genus, "name", "genus_name_upper_trgm"),
+            (Site, "name", "site_name_upper_trgm"),
+            (Neighborhood, "name", "neighborhood_name_upper_trgm"),
+        ],
+    )
+    def test_icontains_uses_trigram_index(
+        self, model, field, index_name, prefer_indexes
+    ):
+        """Test that icontains on each searched name uses its trigram index."""
+        queryset = model.objects.filter(**{f"{field}__icontains": "tree"})
+
+        assert index_name in queryset.order_by().explain()
+
     @pytest.mark.skip(reason="Test fails erratically; needs to be fixed.")
     def test_date_range_filter(self, authenticated_client, biodiversity_record):
         """Test filtering biodiversity records by date range."""
@@ -194,6 +301,25 @@ class TestSpatialEndpoints:
         assert len(response.data) == 1
         assert response.data[0]["id"] == fixed_location_record.id
 
+    def test_near_endpoint_orders_by_distance(
+        self, authenticated_client, fixed_location_record
+    ):
+        """Test that the near endpoint returns the closest records first."""
+        closer = BiodiversityRecordFactory(location=Point(-75.2001, 4.3, srid=4326))
+        BiodiversityRecordFactory(location=Point(-75.21, 4.3, srid=4326))
+
+        url = (
+            reverse("biodiversity:biodiversity-record-list")
+            + "near/?lat=4.3&lon=-75.2002&radius=5000&limit=2"
+        )
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["id"] for record in response.data] == [
+            closer.id,
+            fixed_location_record.id,
+        ]
+
     def test_bbox_endpoint(self, authenticated_client, fixed_location_record):
         """Test the bbox endpoint for bounding box search."""
         # Define a bounding box that includes the fixed location
@@ -207,6 +333,25 @@ class TestSpatialEndpoints:
         assert len(response.data) == 1
         assert response.data[0]["id"] == fixed_location_record.id
 
+    def test_bbox_endpoint_follows_latitude_lines(self, authenticated_client):
+        """Test that wide boxes keep straight edges along the requested latitudes.
+
+        Geodesic edges between the corners of this box bow up to ~0.6° north
+        of the south edge and ~1.2° north of the north edge.
+        """
+        near_south_edge = BiodiversityRecordFactory(
+            location=Point(-70.0, 10.3, srid=4326)
+        )
+        BiodiversityRecordFactory(location=Point(-70.0, 20.5, srid=4326))
+        url = reverse("biodiversity:biodiversity-record-list") + "bbox/"
+
+        response = authenticated_client.get(
+            url, {"min_lon": -90, "min_lat": 10, "max_lon": -50, "max_lat": 20}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["id"] for record in response.data] == [near_south_edge.id]
+
     def test_by_neighborhood_endpoint(self, authenticated_client, biodiversity_record):
         """Test the by_neighborhood endpoint."""
         url = (
@@ -216,8 +361,48 @@ class TestSpatialEndpoints:
         response = authenticated_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        # Since this endpoint returns GeoJSON, check the features
-        assert len(response.data["features"]) == 1
+        # Since this endpoint streams GeoJSON, check the features
+        data = json.loads(b"".join(response.streaming_content))
+        assert len(data["features"]) == 1
+
+    def test_by_neighborhood_endpoint_query_count(
+        self, authenticated_client, biodiversity_record, django_assert_num_queries
+    ):
+        """Test that related objects are fetched with the records, not per row."""
+        BiodiversityRecordFactory.create_batch(
+            3, neighborhood=biodiversity_record.neighborhood
+        )
+        url = (
+            reverse("biodiversity:biodiversity-record-list")
+            + f"by_neighborhood/?id={biodiversity_record.neighborhood.id}"
+        )
+
+        # Features are serialized while the response is consumed
+        with django_assert_num_queries(1):
+            response = authenticated_client.get(url)
+            data = json.loads(b"".join(response.streaming_content))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(data["features"]) == 4
+
+    def test_by_neighborhood_endpoint_rounds_coordinates(
+        self, authenticated_client, biodiversity_record
+    ):
+        """Test that GeoJSON coordinates are truncated to a useful precision."""
+        biodiversity_record.location = Point(-75.123456789, 4.987654321, srid=4326)
+        biodiversity_record.save()
+
+        url = (
+            reverse("biodiversity:biodiversity-record-list")
+            + f"by_neighborhood/?id={biodiversity_record.neighborhood.id}"
+        )
+        response = authenticated_client.get(url)
+        data = json.loads(b"".join(response.streaming_content))
+
+        assert data["features"][0]["geometry"]["coordinates"] == [
+            -75.123457,
+            4.987654,
+        ]
 
     def test_by_locality_endpoint(self, authenticated_client, biodiversity_record):
         """Test the by_locality endpoint."""
@@ -228,8 +413,25 @@ class TestSpatialEndpoints:
         response = authenticated_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        # Since this endpoint returns GeoJSON, check the features
-        assert len(response.data["features"]) == 1
+        # Since this endpoint streams GeoJSON, check the features
+        data = json.loads(b"".join(response.streaming_content))
+        assert len(data["features"]) == 1
+
+    def test_stream_endpoint(self, authenticated_client, biodiversity_record):
+        """Test the stream endpoint with keyset pagination."""
+        url = reverse("biodiversity:biodiversity-record-list") + "stream/"
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = json.loads(b"".join(response.streaming_content))
+        assert data["type"] == "FeatureCollection"
+        assert [feature["id"] for feature in data["features"]] == [
+            biodiversity_record.id
+        ]
+
+        response = authenticated_client.get(url, {"after": biodiversity_record.id})
+        data = json.loads(b"".join(response.streaming_content))
+        assert data["features"] == []
 
     def test_by_polygon_endpoint(self, authenticated_client, fixed_location_record):
         """Test the by_polygon endpoint."""
@@ -243,3 +445,39 @@ class TestSpatialEndpoints:
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
+
+    def test_by_polygon_endpoint_follows_latitude_lines(self, authenticated_client):
+        """Test that wide polygons keep straight edges along their vertices'
+        latitudes, matching the bbox endpoint for the same shape.
+
+        Geodesic edges between these vertices bow up to ~0.6° north of the
+        south edge and ~1.2° north of the north edge.
+        """
+        near_south_edge = BiodiversityRecordFactory(
+            location=Point(-70.0, 10.3, srid=4326)
+        )
+        BiodiversityRecordFactory(location=Point(-70.0, 20.5, srid=4326))
+        polygon = [[-90, 10], [-50, 10], [-50, 20], [-90, 20], [-90, 10]]
+
+        url = reverse("biodiversity:biodiversity-record-list") + "by_polygon/"
+        response = authenticated_client.post(
+            url, data=json.dumps({"polygon": polygon}), content_type="application/json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["id"] for record in response.data] == [near_south_edge.id]
+
+    def test_by_polygon_endpoint_excludes_points_outside_polygon(
+        self, authenticated_client, fixed_location_record
+    ):
+        """Test that points inside the polygon's bounding box but outside the
+        polygon itself are not returned."""
+        polygon = [[-75.3, 4.2], [-75.1, 4.2], [-75.3, 4.35], [-75.3, 4.2]]
+
+        url = reverse("biodiversity:biodiversity-record-list") + "by_polygon/"
+        response = authenticated_client.post(
+            url, data=json.dumps({"polygon": polygon}), content_type="application/json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
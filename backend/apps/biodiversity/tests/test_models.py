@@ -1,5 +1,8 @@
 import pytest
 from django.contrib.gis.geos import Point
+from django.db import connection
+
+from apps.biodiversity.models import BiodiversityRecord
 
 
 @pytest.mark.django_db
@@ -31,3 +34,34 @@ def test_biodiversity_record_properties(biodiversity_record):
     finally:
         # Restore the original location
         biodiversity_record.location = original_location
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("column", "index_type"), [("location", "gist"), ("neighborhood_id", "btree")]
+)
+def test_record_column_is_indexed(column, index_type):
+    """Test that spatial and neighborhood lookups on records use an index."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, BiodiversityRecord._meta.db_table
+        )
+    assert any(
+        constraint["index"]
+        and constraint["columns"] == [column]
+        and constraint["type"] == index_type
+        for constraint in constraints.values()
+    )
+
+
+@pytest.mark.django_db
+def test_record_location_has_planar_spatial_index():
+    """Test that planar tests on location::geometry are backed by a GiST index."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+            [BiodiversityRecord._meta.db_table, "bio_location_geom_gist"],
+        )
+        (definition,) = cursor.fetchone()
+    assert "USING gist" in definition
+    assert "(location)::geometry(Point,4326)" in definition
@@ -0,0 +1,188 @@
+from types import SimpleNamespace
+
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+
+from apps.biodiversity.spatial import BoundaryIndex
+
+
+class TestBoundaryIndex:
+    def test_find_returns_first_containing_boundary(self):
+        """Test that lookups honor the order the boundaries were given in."""
+        large = SimpleNamespace(
+            name="Large",
+            boundary=MultiPolygon(Polygon.from_bbox((-76.0, 4.0, -75.0, 5.0))),
+        )
+        small = SimpleNamespace(
+            name="Small",
+            boundary=MultiPolygon(Polygon.from_bbox((-75.25, 4.40, -75.20, 4.45))),
+        )
+
+        index = BoundaryIndex([small, large])
+
+        assert index.find(Point(-75.23, 4.43)) is small
+        assert index.find(Point(-75.50, 4.70)) is large
+        assert index.find(Point(-74.00, 4.70)) is None
+
+    def test_find_all_matches_points_in_order(self):
+        """Test that batch lookups agree with single-point lookups."""
+        boundary = SimpleNamespace(
+            name="Center",
+            boundary=MultiPolygon(Polygon.from_bbox((-75.25, 4.40, -75.20, 4.45))),
+        )
+        index = BoundaryIndex([boundary])
+
+        assert index.find_all([Point(-75.50, 4.47), Point(-75.23, 4.43)]) == [
+            None,
+            boundary,
+        ]
+        assert index.find_all([]) == []
+
+    def test_find_in_cell_covered_by_boundary(self):
+        """Test that cells inside the first candidate resolve without PIP tests."""
+        large = SimpleNamespace(
+            name="Large",
+            boundary=MultiPolygon(Polygon.from_bbox((-76.0, 4.0, -75.0, 5.0))),
+        )
+        small = SimpleNamespace(
+            name="Small",
+            boundary=MultiPolygon(Polygon.from_bbox((-75.25, 4.40, -75.20, 4.45))),
+        )
+
+        index = BoundaryIndex([large, small], cells_per_side=8)
+
+        assert index.covered
+        assert set(index.covered.values()) == {0}
+        assert index.find(Point(-75.50, 4.50)) is large
+        assert index.find(Point(-75.23, 4.43)) is large
+
+    def test_find_positions_memoizes_repeated_coordinates(self, monkeypatch):
+        """Test that repeated coordinates reuse the first containment result
+        within a batch, and that nothing is kept once the batch is done."""
+        boundary = SimpleNamespace(
+            name="Triangle",
+            boundary=MultiPolygon(
+                Polygon(((-76.0, 4.0), (-75.0, 4.0), (-76.0, 5.0), (-76.0, 4.0)))
+            ),
+        )
+        index = BoundaryIndex([boundary], cells_per_side=1)
+        tested = []
+        find_in_cell = index._find_in_cell
+
+        def counting_find_in_cell(x, y, cell):
+            tested.append((x, y))
+            return find_in_cell(x, y, cell)
+
+        monkeypatch.setattr(index, "_find_in_cell", counting_find_in_cell)
+        coords = [(-75.9, 4.1), (-75.1, 4.9), (-75.9, 4.1)]
+
+        assert index.find_positions(coords) == [0, -1, 0]
+        assert tested == [(-75.9, 4.1), (-75.1, 4.9)]
+        assert index.find_positions(coords[:1]) == [0]
+        assert tested[-1] == (-75.9, 4.1)
+        assert len(tested) == 3
+
+    def test_find_skips_candidates_outside_their_envelope(self):
+        """Test that a point outside a candidate's envelope is not tested."""
+        west = SimpleNamespace(
+            name="West",
+            boundary=MultiPolygon(Polygon.from_bbox((-76.0, 4.0, -75.6, 5.0))),
+        )
+        east = SimpleNamespace(
+            name="East",
+            boundary=MultiPolygon(Polygon.from_bbox((-75.4, 4.0, -75.0, 5.0))),
+        )
+        index = BoundaryIndex([west, east], cells_per_side=1)
+        position, extent, _ = index.parts[0, 0][0]
+        index.parts[0, 0][0] = (position, extent, None)
+
+        assert index.find(Point(-75.2, 4.5)) is east
+        assert index.find(Point(-75.5, 4.5)) is None
+
+    def test_cells_only_keep_boundary_pieces_reaching_them(self):
+        """Test that boundaries are clipped to the cells they actually reach."""
+        corner = SimpleNamespace(
+            name="Corner",
+            boundary=MultiPolygon(
+                Polygon(
+                    (
+                        (-76.0, 4.0),
+                        (-75.0, 4.0),
+                        (-75.0, 4.4),
+                        (-75.6, 4.4),
+                        (-75.6, 5.0),
+                        (-76.0, 5.0),
+                        (-76.0, 4.0),
+                    )
+                )
+            ),
+        )
+        index = BoundaryIndex([corner], cells_per_side=2)
+
+        assert (1, 1) in index.cells
+        assert index.grid[1, 1] == -1
+        assert index.parts[0, 0][0][1] == (-76.0, 4.0, -75.5, 4.5)
+        assert index.find(Point(-75.2, 4.8)) is None
+        assert index.find(Point(-75.8, 4.8)) is corner
+        assert index.find(Point(-75.2, 4.2)) is corner
+
+    def test_invalid_boundary_is_tested_whole(self):
+        """Test that a self-intersecting boundary is indexed without clipping."""
+        bow_tie = SimpleNamespace(
+            name="Bow tie",
+            boundary=MultiPolygon(
+                Polygon(
+                    (
+                        (-76.0, 4.0),
+                        (-75.0, 5.0),
+                        (-75.0, 4.0),
+                        (-76.0, 5.0),
+                        (-76.0, 4.0),
+                    )
+                )
+            ),
+        )
+        assert not bow_tie.boundary.valid
+
+        index = BoundaryIndex([bow_tie], cells_per_side=2)
+
+        assert not index.covered
+        assert index.find(Point(-75.9, 4.5)) is bow_tie
+        assert index.find(Point(-75.1, 4.5)) is bow_tie
+        assert index.find(Point(-75.5, 4.1)) is None
+
+    def test_boundary_edge_on_grid_line_is_tested_whole(self):
+        """Test that a cell whose clip mixes polygons and border lines is
+        indexed with the whole boundary."""
+        u_shape = SimpleNamespace(
+            name="U shape",
+            boundary=MultiPolygon(
+                Polygon(
+                    (
+                        (0.0, 0.0),
+                        (2.0, 0.0),
+                        (2.0, 3.0),
+                        (3.0, 3.0),
+                        (3.0, 0.0),
+                        (4.0, 0.0),
+                        (4.0, 4.0),
+                        (0.0, 4.0),
+                        (0.0, 0.0),
+                    )
+                )
+            ),
+        )
+        # The edge at x = 2 runs along the western border of cell (1, 0)
+        clip = u_shape.boundary.intersection(Polygon.from_bbox((2.0, 0.0, 4.0, 2.0)))
+        assert clip.geom_type == "GeometryCollection"
+
+        index = BoundaryIndex([u_shape], cells_per_side=2)
+
+        assert index.parts[1, 0] == [(0, u_shape.boundary.extent, index.prepared[0])]
+        assert index.find(Point(3.5, 1.0)) is u_shape
+        assert index.find(Point(2.0, 1.0)) is u_shape
+        assert index.find(Point(2.5, 1.0)) is None
+        assert index.find(Point(1.0, 1.0)) is u_shape
+
+    def test_find_with_no_boundaries(self):
+        """Test that an empty index never matches."""
+        assert BoundaryIndex([]).find(Point(-75.23, 4.43)) is None
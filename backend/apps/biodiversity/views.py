@@ -1,12 +1,22 @@
+import json
+
 import django_filters
+from django.contrib.gis.db.models import PointField
 from django.contrib.gis.geos import Point, Polygon
 from django.contrib.gis.measure import D
 from django.db.models import Q
+from django.db.models.functions import Cast
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.core.functions import EqualsAny, KNNDistance
+from apps.places.models import Neighborhood, Site
+from apps.taxonomy.models import Genus, Species
 
 from .models import BiodiversityRecord
 from .serializers import (
@@ -46,19 +56,38 @@ class BiodiversityRecordFilter(django_filters.FilterSet):
         }
 
     def search_filter(self, queryset, name, value):
-        """Custom search filter across multiple fields."""
+        """Custom search filter across multiple fields.
+
+        Related names are matched in their own (small) tables by subqueries
+        of the same statement. Every branch of the OR is then an indexed
+        condition on the records table, which PostgreSQL can combine with a
+        BitmapOr instead of scanning all records.
+        """
+        genus_ids = Genus.objects.filter(name__icontains=value).values_list(
+            "id", flat=True
+        )
+        species_ids = Species.objects.filter(
+            Q(name__icontains=value) | Q(EqualsAny("genus", genus_ids))
+        ).values_list("id", flat=True)
+        site_ids = Site.objects.filter(name__icontains=value).values_list(
+            "id", flat=True
+        )
+        neighborhood_ids = Neighborhood.objects.filter(
+            name__icontains=value
+        ).values_list("id", flat=True)
         return queryset.filter(
             Q(common_name__icontains=value)
-            | Q(species__name__icontains=value)
-            | Q(species__genus__name__icontains=value)
-            | Q(site__name__icontains=value)
-            | Q(neighborhood__name__icontains=value)
+            | Q(EqualsAny("species", species_ids))
+            | Q(EqualsAny("site", site_ids))
+            | Q(EqualsAny("neighborhood", neighborhood_ids))
         )
 
 
 class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for BiodiversityRecord model."""
 
+    # Place boundaries are large multipolygons no serializer reads, so they
+    # are left out of the joined rows
     queryset = BiodiversityRecord.objects.select_related(
         "species",
         "species__genus",
@@ -67,6 +96,10 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
         "neighborhood",
         "neighborhood__locality",
         "neighborhood__locality__municipality",
+    ).defer(
+        "neighborhood__boundary",
+        "neighborhood__locality__boundary",
+        "neighborhood__locality__municipality__boundary",
     )
     serializer_class = BiodiversityRecordSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -80,7 +113,8 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
         "date",
         "created_at",
     ]
-    ordering = ["-date"]
+    # ID breaks ties between records of the same date, keeping pages stable
+    ordering = ["-date", "-id"]
 
     def get_serializer_class(self):
         """Return appropriate serializer class."""
@@ -115,10 +149,14 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
         # Limit radius to 10km to prevent performance issues
         radius = min(radius, 10000)
 
-        # Get records within the radius
-        records = BiodiversityRecord.objects.filter(
-            location__dwithin=(Point(lon, lat), D(m=radius))
-        ).order_by("location")[:limit]
+        # Get records within the radius, nearest first
+        point = Point(lon, lat, srid=4326)
+        records = (
+            self.get_queryset()
+            .filter(location__dwithin=(point, D(m=radius)))
+            .annotate(distance=KNNDistance("location", point))
+            .order_by("distance")[:limit]
+        )
 
         serializer = self.get_serializer(records, many=True)
         return Response(serializer.data)
@@ -153,11 +191,19 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Create bounding box
         bbox = Polygon.from_bbox((min_lon, min_lat, max_lon, max_lat))
-
-        # Get records within the bounding box
-        records = BiodiversityRecord.objects.filter(location__contained=bbox).order_by(
-            "location"
-        )[:limit]
+        bbox.srid = 4326
+
+        # Get records within the bounding box. The test runs on planar
+        # geometry, as on geography the box edges would be great circles
+        # bowing away from the requested latitudes. ST_CoveredBy filters on
+        # the location::geometry GiST index first, then tests the candidates
+        # exactly; without an ORDER BY the scan can stop at the limit
+        records = (
+            self.get_queryset()
+            .alias(location_geom=Cast("location", PointField(srid=4326)))
+            .filter(location_geom__coveredby=bbox)
+            .order_by()[:limit]
+        )
 
         serializer = self.get_serializer(records, many=True)
         return Response(serializer.data)
@@ -183,12 +229,13 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
         limit = min(limit, 1000)
 
         # Get records for the neighborhood
-        records = BiodiversityRecord.objects.filter(
-            neighborhood_id=neighborhood_id
-        ).order_by("location")[:limit]
+        records = (
+            self.get_queryset()
+            .filter(neighborhood_id=neighborhood_id)
+            .order_by()[:limit]
+        )
 
-        serializer = BiodiversityRecordGeoSerializer(records, many=True)
-        return Response(serializer.data)
+        return self._stream_features(records)
 
     @action(detail=False, methods=["get"])
     def by_locality(self, request):
@@ -211,12 +258,62 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
         limit = min(limit, 2000)
 
         # Get records for the locality
-        records = BiodiversityRecord.objects.filter(
-            neighborhood__locality_id=locality_id
-        ).order_by("location")[:limit]
+        records = (
+            self.get_queryset()
+            .filter(neighborhood__locality_id=locality_id)
+            .order_by()[:limit]
+        )
 
-        serializer = BiodiversityRecordGeoSerializer(records, many=True)
-        return Response(serializer.data)
+        return self._stream_features(records)
+
+    @action(detail=False, methods=["get"])
+    def stream(self, request):
+        """Stream records as a GeoJSON FeatureCollection, in ID order.
+
+        Features are serialized one at a time while rows are read from the
+        database, so memory stays flat however many records are returned.
+        Supports the same filters as the list endpoint.
+
+        Query parameters:
+        - after: only return records with a greater ID, e.g. the ID of the
+          last feature of the previous response (default: 0)
+        - limit: maximum number of results (default: 5000)
+        """
+        try:
+            after = int(request.query_params.get("after", 0))
+            limit = int(request.query_params.get("limit", 5000))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "Invalid parameters. after and limit must be numeric."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Limit to 5000 records to keep each response bounded
+        limit = min(limit, 5000)
+
+        # Keyset pagination on the primary key instead of OFFSET
+        records = (
+            self.filter_queryset(self.get_queryset())
+            .filter(id__gt=after)
+            .order_by("id")[:limit]
+        )
+        return self._stream_features(records)
+
+    def _stream_features(self, records):
+        """Return the records as a GeoJSON FeatureCollection streamed feature by
+        feature, so the whole collection is never held in memory."""
+        serializer = BiodiversityRecordGeoSerializer()
+
+        def features():
+            yield '{"type": "FeatureCollection", "features": ['
+            for i, record in enumerate(records.iterator(chunk_size=500)):
+                feature = json.dumps(
+                    serializer.to_representation(record), cls=JSONEncoder
+                )
+                yield feature if i == 0 else f",{feature}"
+            yield "]}"
+
+        return StreamingHttpResponse(features(), content_type="application/json")
 
     @action(
         detail=False, methods=["post"], permission_classes=[IsAuthenticatedOrReadOnly]
@@ -254,15 +351,19 @@ class BiodiversityRecordViewSet(viewsets.ReadOnlyModelViewSet):
                 polygon_coords.append(polygon_coords[0])
 
             # Create polygon
-            polygon = Polygon(polygon_coords)
+            polygon = Polygon(polygon_coords, srid=4326)
 
             # Limit to 1000 records to prevent performance issues
             limit = min(limit, 1000)
 
-            # Get records within the polygon
-            records = BiodiversityRecord.objects.filter(
-                location__contained=polygon
-            ).order_by("location")[:limit]
+            # Get records within the polygon, tested on planar geometry with
+            # straight edges between the vertices, as the bbox action does
+            records = (
+                self.get_queryset()
+                .alias(location_geom=Cast("location", PointField(srid=4326)))
+                .filter(location_geom__coveredby=polygon)
+                .order_by()[:limit]
+            )
 
             serializer = self.get_serializer(records, many=True)
             return Response(serializer.data)
@@ -3,6 +3,9 @@ from django.contrib.gis.admin import GISModelAdmin
 
 from .models import Climate, Station
 
+# Built once, as get_sensor_display() rebuilds the choices dict on every call
+SENSOR_LABELS = dict(Climate.SensorDescription.choices)
+
 
 @admin.register(Station)
 class StationAdmin(GISModelAdmin):
@@ -22,20 +25,42 @@ class ClimateAdmin(admin.ModelAdmin):
         "sensor_display",
         "measurement",
     )
-    list_filter = ("station", "station__municipality", "sensor", "measure_unit", "date")
+    # Only offer the municipalities that have stations, instead of every
+    # municipality in the country
+    list_filter = (
+        "station",
+        ("station__municipality", admin.RelatedOnlyFieldListFilter),
+        "sensor",
+        "measure_unit",
+        "date",
+    )
+    list_select_related = ("station__municipality__department__country",)
     search_fields = ("station__name", "station__code")
     raw_id_fields = ("station",)
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "date"
     list_per_page = 25
 
+    def get_queryset(self, request):
+        # The municipality column renders its department and country names,
+        # joined through list_select_related, but none of their boundaries
+        return (
+            super()
+            .get_queryset(request)
+            .defer(
+                "station__municipality__boundary",
+                "station__municipality__department__boundary",
+                "station__municipality__department__country__boundary",
+            )
+        )
+
     @admin.display(description="Municipality")
     def station_municipality(self, obj):
         return obj.station.municipality
 
-    @admin.display(description="Sensor")
+    @admin.display(description="Sensor", ordering="sensor")
     def sensor_display(self, obj):
-        return obj.get_sensor_display()
+        return SENSOR_LABELS.get(obj.sensor, obj.sensor)
 
     @admin.display(description="Value")
     def measurement(self, obj):
@@ -1,13 +1,32 @@
-import random
-
 import factory
-from django.contrib.gis.geos import Point
 from factory.django import DjangoModelFactory
 
 from apps.climate.models import Climate, Station
-from apps.core.factories import BaseFactory
+from apps.core.factories import COLOMBIA_BOUNDS, BaseFactory, random_point
 from apps.places.factories import MunicipalityFactory
 
+# Municipality locations can be added when specific tests need them
+MUNICIPALITY_BOUNDS = {
+    "Ibagué": {
+        "lon_min": -75.3,
+        "lon_max": -75.1,
+        "lat_min": 4.35,
+        "lat_max": 4.5,
+    }
+    # Add other municipalities as needed for tests
+}
+
+
+def station_location(station):
+    """Return a random location for a station, consistent with its municipality.
+
+    Stations in a municipality listed in MUNICIPALITY_BOUNDS are placed within
+    its bounds; any other station gets a random point in Colombia (roughly).
+    """
+    return random_point(
+        MUNICIPALITY_BOUNDS.get(station.municipality.name, COLOMBIA_BOUNDS)
+    )
+
 
 class StationFactory(DjangoModelFactory):
     class Meta:
@@ -17,48 +36,11 @@ class StationFactory(DjangoModelFactory):
     code = factory.Sequence(lambda n: n + 1000)  # Start from 1000
     name = factory.Sequence(lambda n: f"Weather Station {n}")
 
-    # Generate a random point in Colombia (roughly)
-    # Colombia bounds: ~(66°W to 79°W) and (~-4°S to 13°N)
-    location = factory.LazyFunction(
-        lambda: Point(
-            random.uniform(-79.0, -66.0),  # longitude
-            random.uniform(-4.0, 13.0),  # latitude
-            srid=4326,
-        )
-    )
+    # Resolved before the station is saved, so a single INSERT is enough
+    location = factory.LazyAttribute(station_location)
 
     municipality = factory.SubFactory(MunicipalityFactory)
 
-    @factory.post_generation
-    def set_location_for_specific_municipalities(self, create, extracted, **kwargs):
-        """Set location coordinates appropriate for the municipality if needed.
-
-        This is a hook for tests to ensure geographic consistency when required.
-        Called automatically by the set_municipality parameter or can be used in fixtures.
-        """
-        if not create:
-            return
-
-        # Municipality locations can be added when specific tests need them
-        municipality_bounds = {
-            "Ibagué": {
-                "lon_min": -75.3,
-                "lon_max": -75.1,
-                "lat_min": 4.35,
-                "lat_max": 4.5,
-            }
-            # Add other municipalities as needed for tests
-        }
-
-        if self.municipality.name in municipality_bounds:
-            bounds = municipality_bounds[self.municipality.name]
-            self.location = Point(
-                random.uniform(bounds["lon_min"], bounds["lon_max"]),
-                random.uniform(bounds["lat_min"], bounds["lat_max"]),
-                srid=4326,
-            )
-            self.save()
-
 
 class ClimateFactory(BaseFactory):
     class Meta:
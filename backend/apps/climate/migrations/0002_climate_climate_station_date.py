@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2025-05-10 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('climate', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='climate',
+            index=models.Index(fields=['station', 'date'], name='climate_station_date'),
+        ),
+    ]
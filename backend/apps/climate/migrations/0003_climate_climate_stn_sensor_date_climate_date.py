@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2025-05-10 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('climate', '0002_climate_climate_station_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='climate',
+            index=models.Index(fields=['station', 'sensor', 'date'], name='climate_stn_sensor_date'),
+        ),
+        migrations.AddIndex(
+            model_name='climate',
+            index=models.Index(fields=['date'], name='climate_date'),
+        ),
+    ]
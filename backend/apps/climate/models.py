@@ -68,6 +68,16 @@ class Climate(BaseModel):
         verbose_name = _("climate data")
         verbose_name_plural = _("climate data")
         ordering = ["station", "date"]
+        indexes = [
+            # Station time series, filtered by date range in the API
+            models.Index(fields=["station", "date"], name="climate_station_date"),
+            # One sensor of a station over a date range
+            models.Index(
+                fields=["station", "sensor", "date"], name="climate_stn_sensor_date"
+            ),
+            # Default API ordering (-date) and unfiltered date range queries
+            models.Index(fields=["date"], name="climate_date"),
+        ]
 
     def __str__(self):
         return f"{self.station} - {self.date} - {self.value} {self.measure_unit}"
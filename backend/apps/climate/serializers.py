@@ -38,7 +38,7 @@ class StationGeoSerializer(GeoFeatureModelSerializer):
 class ClimateSerializer(serializers.ModelSerializer):
     """Serializer for the Climate model."""
 
-    # For write operations and list views, just use the station ID
+    # For write operations, just use the station ID
     station_id = serializers.PrimaryKeyRelatedField(
         source="station",
         queryset=Station.objects.all(),
@@ -46,7 +46,7 @@ class ClimateSerializer(serializers.ModelSerializer):
         required=False,
     )
 
-    # For read operations in detail views, provide the full station data
+    # For read operations, provide the full station data
     station = serializers.SerializerMethodField()
 
     municipality = MunicipalitySerializer(source="station.municipality", read_only=True)
@@ -56,11 +56,7 @@ class ClimateSerializer(serializers.ModelSerializer):
     )
 
     def get_station(self, obj):
-        """Return the station ID or full station object based on context."""
-        # For list views, just return the ID
-        if self.context.get("view") and self.context["view"].action == "list":
-            return obj.station.id
-        # For detail views, return the full station serialization
+        """Return the full station serialization."""
         return StationSerializer(obj.station).data
 
     class Meta:
@@ -80,3 +76,37 @@ class ClimateSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+
+
+class ClimateListSerializer(ClimateSerializer):
+    """Serializer for Climate list views.
+
+    The station and municipality are reduced to their IDs (plus the
+    municipality name), so list rows do not embed any boundaries.
+    """
+
+    station = serializers.PrimaryKeyRelatedField(read_only=True)
+    municipality = serializers.IntegerField(
+        source="station.municipality_id", read_only=True
+    )
+    municipality_name = serializers.CharField(
+        source="station.municipality.name", read_only=True
+    )
+
+    class Meta(ClimateSerializer.Meta):
+        fields = [
+            "id",
+            "uuid",
+            "station",
+            "station_id",
+            "municipality",
+            "municipality_name",
+            "date",
+            "sensor",
+            "sensor_display",
+            "value",
+            "measure_unit",
+            "measure_unit_display",
+            "created_at",
+            "updated_at",
+        ]
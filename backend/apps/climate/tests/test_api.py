@@ -1,9 +1,14 @@
 from datetime import timedelta
 
 import pytest
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
+from apps.climate.factories import ClimateFactory, StationFactory
+
 
 @pytest.mark.django_db
 class TestStationAPI:
@@ -24,6 +29,20 @@ class TestStationAPI:
 
         assert station_found, f"Test station '{station.name}' not found in results"
 
+    def test_station_list_query_count(self, authenticated_client, station):
+        """Test that listing stations does not query per station."""
+        url = reverse("climate:station-list")
+        with CaptureQueriesContext(connection) as single:
+            authenticated_client.get(url)
+
+        StationFactory.create_batch(3)
+        with CaptureQueriesContext(connection) as several:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 4
+        assert len(several) == len(single)
+
     def test_station_detail(self, authenticated_client, station):
         """Test retrieving a specific station."""
         url = reverse("climate:station-detail", args=[station.id])
@@ -139,6 +158,23 @@ class TestStationAPI:
 
         assert station_found, f"Test station '{station.name}' not found in near results"
 
+    def test_near_endpoint_orders_by_distance(self, authenticated_client):
+        """Test that the near endpoint returns the closest stations first."""
+        farther = StationFactory(location=Point(-75.21, 4.4, srid=4326))
+        closer = StationFactory(location=Point(-75.2001, 4.4, srid=4326))
+
+        url = (
+            reverse("climate:station-list")
+            + "near/?lat=4.4&lon=-75.2&radius=5000&limit=2"
+        )
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["code"] for result in response.data] == [
+            closer.code,
+            farther.code,
+        ]
+
     def test_near_endpoint_validation(self, authenticated_client):
         """Test validation for the near endpoint."""
         # Missing lat parameter
@@ -178,14 +214,43 @@ class TestClimateAPI:
 
         assert record_found, "Test climate record not found in results"
 
+    def test_climate_list_municipality(self, authenticated_client, climate_record):
+        """Test that list rows carry the municipality ID and name only."""
+        url = reverse("climate:climate-list") + f"?station={climate_record.station.id}"
+        response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.data["results"][0]
+        municipality = climate_record.station.municipality
+        assert result["municipality"] == municipality.id
+        assert result["municipality_name"] == municipality.name
+
+    def test_climate_list_query_count(self, authenticated_client, climate_record):
+        """Test that listing does not query per record or station."""
+        url = reverse("climate:climate-list") + "?page=1"
+        with CaptureQueriesContext(connection) as single:
+            authenticated_client.get(url)
+
+        ClimateFactory.create_batch(3)
+        with CaptureQueriesContext(connection) as several:
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 4
+        assert len(several) == len(single)
+
     def test_climate_detail(self, authenticated_client, climate_record):
         """Test retrieving a specific climate record."""
         url = reverse("climate:climate-detail", args=[climate_record.id])
         response = authenticated_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        # In detail view, station is an object (not an ID)
+        # In detail view, station and municipality are objects (not IDs)
         assert response.data["station"]["id"] == climate_record.station.id
+        assert (
+            response.data["municipality"]["id"]
+            == climate_record.station.municipality.id
+        )
         assert response.data["value"] == climate_record.value
         assert response.data["sensor"] == climate_record.sensor
         assert response.data["measure_unit"] == climate_record.measure_unit
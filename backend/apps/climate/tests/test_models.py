@@ -1,5 +1,8 @@
 import pytest
 
+from apps.climate.factories import ClimateFactory
+from apps.climate.models import Climate
+
 
 @pytest.mark.django_db
 def test_station_str(station):
@@ -14,3 +17,13 @@ def test_climate_str(climate_record):
         str(climate_record)
         == f"{climate_record.station} - {climate_record.date} - {climate_record.value} {climate_record.measure_unit}"
     )
+
+
+@pytest.mark.django_db
+def test_climate_factory_create_batch_bulk(station, django_assert_num_queries):
+    """Test that bulk factory batches are saved in a single INSERT."""
+    with django_assert_num_queries(1):
+        records = ClimateFactory.create_batch_bulk(5, station=station)
+
+    assert len(records) == 5
+    assert Climate.objects.filter(station=station).count() == 5
@@ -7,8 +7,15 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from apps.core.functions import KNNDistance
+
 from .models import Climate, Station
-from .serializers import ClimateSerializer, StationGeoSerializer, StationSerializer
+from .serializers import (
+    ClimateListSerializer,
+    ClimateSerializer,
+    StationGeoSerializer,
+    StationSerializer,
+)
 
 
 class StationFilter(django_filters.FilterSet):
@@ -26,7 +33,7 @@ class StationFilter(django_filters.FilterSet):
 class StationViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for Station model."""
 
-    queryset = Station.objects.select_related("municipality")
+    queryset = Station.objects.select_related("municipality__department__country")
     serializer_class = StationSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [
@@ -46,6 +53,13 @@ class StationViewSet(viewsets.ReadOnlyModelViewSet):
             return StationGeoSerializer
         return StationSerializer
 
+    def get_queryset(self):
+        """Load only the columns the selected serializer reads."""
+        if self.get_serializer_class() is StationGeoSerializer:
+            # Features carry the point and a few properties, no municipality
+            return Station.objects.only("id", "code", "name", "location")
+        return super().get_queryset()
+
     @action(detail=False, methods=["get"])
     def near(self, request):
         """Filter stations by proximity to a point.
@@ -72,10 +86,14 @@ class StationViewSet(viewsets.ReadOnlyModelViewSet):
         # Limit radius to 50km to prevent performance issues
         radius = min(radius, 50000)
 
-        # Get stations within the radius
-        stations = Station.objects.filter(
-            location__dwithin=(Point(lon, lat), D(m=radius))
-        ).order_by("location")[:limit]
+        # Get stations within the radius, nearest first
+        point = Point(lon, lat, srid=4326)
+        stations = (
+            self.get_queryset()
+            .filter(location__dwithin=(point, D(m=radius)))
+            .annotate(distance=KNNDistance("location", point))
+            .order_by("distance")[:limit]
+        )
 
         serializer = self.get_serializer(stations, many=True)
         return Response(serializer.data)
@@ -105,7 +123,7 @@ class ClimateFilter(django_filters.FilterSet):
 class ClimateViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for Climate model."""
 
-    queryset = Climate.objects.select_related("station", "station__municipality")
+    queryset = Climate.objects.select_related("station__municipality")
     serializer_class = ClimateSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -119,10 +137,27 @@ class ClimateViewSet(viewsets.ReadOnlyModelViewSet):
     ]
     ordering = ["-date"]
 
+    def get_serializer_class(self):
+        """Return appropriate serializer class."""
+        if self.action == "list":
+            return ClimateListSerializer
+        return ClimateSerializer
+
     def get_queryset(self):
         """Optimize queryset for large dataset (700,000+ records)."""
         queryset = super().get_queryset()
 
+        # List rows only carry station and municipality IDs and the
+        # municipality name, so no geography column is read
+        if self.action == "list":
+            queryset = queryset.defer(
+                "station__location", "station__municipality__boundary"
+            )
+        else:
+            queryset = queryset.select_related(
+                "station__municipality__department__country"
+            )
+
         # Ensure proper filtering before returning data
         # Instead of slicing the queryset (which causes issues with ordering and filtering),
         # we'll use the primary key values to create a new queryset
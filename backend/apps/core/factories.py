@@ -1,8 +1,37 @@
 import uuid
 
 import factory
+import numpy as np
+from django.contrib.gis.geos import Point
 from django.utils.timezone import now as timezone_now
 
+# Colombia bounds: ~(66°W to 79°W) and (~-4°S to 13°N)
+COLOMBIA_BOUNDS = {"lon_min": -79.0, "lon_max": -66.0, "lat_min": -4.0, "lat_max": 13.0}
+
+# Coordinates are drawn in bulk for each set of bounds and handed out one at a
+# time, so creating many objects does not pay for two random calls per point
+POINT_POOL_SIZE = 1024
+_point_pools = {}
+
+
+def random_point(bounds=COLOMBIA_BOUNDS):
+    """Return a random point within the given lon/lat bounds.
+
+    We use longitude, latitude order for Point
+    """
+    pool = _point_pools.setdefault(tuple(bounds.values()), [])
+    if not pool:
+        longitudes = np.random.uniform(
+            bounds["lon_min"], bounds["lon_max"], POINT_POOL_SIZE
+        )
+        latitudes = np.random.uniform(
+            bounds["lat_min"], bounds["lat_max"], POINT_POOL_SIZE
+        )
+        pool.extend(zip(longitudes.tolist(), latitudes.tolist(), strict=True))
+
+    longitude, latitude = pool.pop()
+    return Point(longitude, latitude, srid=4326)
+
 
 class BaseFactory(factory.django.DjangoModelFactory):
     """Base factory for models inheriting from BaseModel."""
@@ -10,3 +39,15 @@ class BaseFactory(factory.django.DjangoModelFactory):
     uuid = factory.LazyFunction(uuid.uuid4)
     created_at = factory.LazyFunction(timezone_now)
     updated_at = factory.LazyFunction(timezone_now)
+
+    @classmethod
+    def create_batch_bulk(cls, size, batch_size=1000, **kwargs):
+        """Create a batch of instances with bulk_create instead of one INSERT
+        per instance.
+
+        Instances are built without saving, so related objects must be passed
+        in already saved (e.g. ``station=station``), and save() and signals
+        are skipped.
+        """
+        instances = cls.build_batch(size, **kwargs)
+        return cls._meta.model.objects.bulk_create(instances, batch_size=batch_size)
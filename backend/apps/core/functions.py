@@ -0,0 +1,45 @@
+from django.contrib.gis.db.models import PointField
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import BooleanField, FloatField, Func, Value
+
+
+class KNNDistance(Func):
+    """Distance in meters from a geography column to a point, rendered with
+    the PostGIS `<->` operator.
+
+    Unlike ST_Distance, ordering by this expression lets PostgreSQL walk the
+    column's GiST index nearest-first and stop after the requested rows.
+    """
+
+    arg_joiner = " <-> "
+    template = "%(expressions)s"
+    output_field = FloatField()
+
+    def __init__(self, expression, point, **extra):
+        super().__init__(
+            expression,
+            Value(point, output_field=PointField(srid=point.srid, geography=True)),
+            **extra,
+        )
+
+
+class EqualsAny(Func):
+    """Match a column against the values of a single-column queryset,
+    rendered as `column = ANY(ARRAY(subquery))`.
+
+    PostgreSQL can only apply `IN (subquery)` as a row filter once it sits in
+    an OR. The array is instead computed once up front, so the condition
+    stays usable as an index condition, and branches of an OR can still be
+    combined with a BitmapOr.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, expression, queryset, **extra):
+        super().__init__(expression, ArraySubquery(queryset), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        column, array = self.get_source_expressions()
+        column_sql, column_params = compiler.compile(column)
+        array_sql, array_params = compiler.compile(array)
+        return f"{column_sql} = ANY({array_sql})", (*column_params, *array_params)
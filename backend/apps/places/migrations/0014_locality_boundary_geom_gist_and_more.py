@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2025-05-12 16:20
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('places', '0013_site_unique_site_per_zone_subzone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='locality',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('boundary', django.contrib.gis.db.models.fields.MultiPolygonField(srid=4326)), name='locality_boundary_geom_gist'),
+        ),
+        migrations.AddIndex(
+            model_name='neighborhood',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('boundary', django.contrib.gis.db.models.fields.MultiPolygonField(srid=4326)), name='neighborhood_boundary_geom_gist'),
+        ),
+    ]
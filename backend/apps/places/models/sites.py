@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import BaseModel
@@ -21,6 +23,13 @@ class Site(BaseModel):
                 name="unique_site_per_zone_subzone",
             )
         ]
+        indexes = [
+            # Trigram index for icontains searches, which compare UPPER(name)
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="site_name_upper_trgm",
+            ),
+        ]
 
     def __str__(self):
         """Returns a string representation of the site."""
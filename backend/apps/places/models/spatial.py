@@ -1,5 +1,7 @@
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
 from django.db import models
+from django.db.models.functions import Cast, Upper
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import BaseModel
@@ -138,6 +140,13 @@ class Locality(BaseModel):
                 name="unique_locality_per_municipality",
             )
         ]
+        indexes = [
+            # Planar index for point-in-boundary tests on boundary::geometry
+            GistIndex(
+                Cast("boundary", gis_models.MultiPolygonField(srid=4326)),
+                name="locality_boundary_geom_gist",
+            ),
+        ]
 
     def __str__(self):
         """Returns a string representation of the locality, including the
@@ -186,6 +195,18 @@ class Neighborhood(BaseModel):
                 name="unique_neighborhood_per_locality",
             )
         ]
+        indexes = [
+            # Planar index for point-in-boundary tests on boundary::geometry
+            GistIndex(
+                Cast("boundary", gis_models.MultiPolygonField(srid=4326)),
+                name="neighborhood_boundary_geom_gist",
+            ),
+            # Trigram index for icontains searches, which compare UPPER(name)
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="neighborhood_name_upper_trgm",
+            ),
+        ]
 
     def __str__(self):
         """Returns a string representation of the neighborhood, including the
@@ -1,4 +1,7 @@
 import pytest
+from django.db import connection
+
+from apps.places.models import Locality, Neighborhood
 
 
 @pytest.mark.django_db
@@ -49,3 +52,39 @@ def test_site_str(site):
     """Test the string representation of the site."""
     expected = f"{site.name}, Zone {site.zone}, Subzone {site.subzone}"
     assert str(site) == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model", [Locality, Neighborhood])
+def test_boundary_has_spatial_index(model):
+    """Test that boundary containment lookups are backed by a GiST index."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    assert any(
+        constraint["index"]
+        and constraint["columns"] == ["boundary"]
+        and constraint["type"] == "gist"
+        for constraint in constraints.values()
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("model", "index_name"),
+    [
+        (Locality, "locality_boundary_geom_gist"),
+        (Neighborhood, "neighborhood_boundary_geom_gist"),
+    ],
+)
+def test_boundary_has_planar_spatial_index(model, index_name):
+    """Test that planar tests on boundary::geometry are backed by a GiST index."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+            [model._meta.db_table, index_name],
+        )
+        (definition,) = cursor.fetchone()
+    assert "USING gist" in definition
+    assert "(boundary)::geometry(MultiPolygon,4326)" in definition
@@ -16,6 +16,7 @@ class MeasurementAdmin(admin.ModelAdmin):
     list_filter = ("attribute", "unit", "method", "date")
     search_fields = ("biodiversity_record__id", "biodiversity_record__common_name")
     raw_id_fields = ("biodiversity_record",)
+    list_select_related = ("biodiversity_record",)
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "date"
     list_per_page = 25
@@ -58,6 +59,7 @@ class ObservationAdmin(admin.ModelAdmin):
         "field_notes",
     )
     raw_id_fields = ("biodiversity_record",)
+    list_select_related = ("biodiversity_record",)
     readonly_fields = ("created_at", "updated_at")
     date_hierarchy = "date"
     list_per_page = 25
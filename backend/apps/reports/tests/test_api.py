@@ -45,6 +45,21 @@ class TestMeasurementAPI:
             == measurement.biodiversity_record.id
         )
 
+    def test_measurement_detail_query_count(
+        self, authenticated_client, measurement, django_assert_num_queries
+    ):
+        """Test that the nested record is loaded with the measurement."""
+        url = reverse("reports:measurement-detail", args=[measurement.id])
+
+        # One query for the latest IDs, one for the measurement and its record
+        with django_assert_num_queries(2):
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["biodiversity_record"]["species_name"] == (
+            measurement.biodiversity_record.species.scientific_name
+        )
+
     def test_measurement_filter_by_attribute(self, authenticated_client, measurement):
         """Test filtering measurements by attribute."""
         url = (
@@ -31,7 +31,11 @@ class MeasurementFilter(django_filters.FilterSet):
 class MeasurementViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for the Measurement model."""
 
-    queryset = Measurement.objects.select_related("biodiversity_record")
+    queryset = Measurement.objects.select_related(
+        "biodiversity_record__species__genus",
+        "biodiversity_record__site",
+        "biodiversity_record__neighborhood",
+    ).defer("biodiversity_record__neighborhood__boundary")
     serializer_class = MeasurementSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -101,7 +105,11 @@ class ObservationFilter(django_filters.FilterSet):
 class ObservationViewSet(viewsets.ReadOnlyModelViewSet):
     """API endpoint for the Observation model."""
 
-    queryset = Observation.objects.select_related("biodiversity_record")
+    queryset = Observation.objects.select_related(
+        "biodiversity_record__species__genus",
+        "biodiversity_record__site",
+        "biodiversity_record__neighborhood",
+    ).defer("biodiversity_record__neighborhood__boundary")
     serializer_class = ObservationSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
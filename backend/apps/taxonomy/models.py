@@ -14,8 +14,10 @@ Key database constraints and model design notes:
   schema is extensible if new TraitTypes are added.
 """
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
@@ -52,6 +54,13 @@ class Genus(BaseModel):
         verbose_name = _("genus")
         verbose_name_plural = _("genera")
         ordering = ["name"]
+        indexes = [
+            # Trigram index for icontains searches, which compare UPPER(name)
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="genus_name_upper_trgm",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -286,6 +295,13 @@ class Species(BaseModel):
                 name="unique_genus_species",
             ),
         ]
+        indexes = [
+            # Trigram index for icontains searches, which compare UPPER(name)
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="species_name_upper_trgm",
+            ),
+        ]
 
     def __str__(self):
         return self.scientific_name
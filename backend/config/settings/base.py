@@ -51,6 +51,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Serving static files
+    "django.middleware.gzip.GZipMiddleware",  # Compress large API responses
+    "django.middleware.http.ConditionalGetMiddleware",  # ETags and 304 replies
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",  # Language detection
     "corsheaders.middleware.CorsMiddleware",  # CORS support
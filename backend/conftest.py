@@ -1,4 +1,5 @@
 import pytest
+from django.db import connection
 from rest_framework.test import APIClient
 
 from apps.biodiversity.factories import BiodiversityRecordFactory
@@ -211,3 +212,16 @@ def climate_record(station):
         value=25.5,
         measure_unit="°C",  # Celsius
     )
+
+
+@pytest.fixture
+def prefer_indexes(db):
+    """Make the query planner use bitmap index scans wherever an index applies.
+
+    Test tables hold a handful of rows, so a sequential scan would otherwise
+    always win. The settings are local to the test's transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_indexscan = off")
+        cursor.execute("SET LOCAL enable_indexonlyscan = off")